@@ -1,197 +1,249 @@
 #!/usr/bin/env python3
 
+import io
+import itertools
 import json
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rich.text import Text
+
+# orjson is an optional speedup for parsing (potentially large) tool-call arguments;
+# its JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 from .config import (
     get_client, console, get_current_model,
     get_provider_headers, get_provider_extra_body, supports_reasoning
 )
-from .tools import tools
+from .tools import get_all_tools
 from .conversation import conversation_history, trim_conversation_history
 from .file_operations import (
     read_local_file, create_file, normalize_path, ensure_file_in_context,
-    apply_diff_edit
+    apply_diff_edit, append_diagnostics
 )
-from .error_detection import run_linter_auto, is_supported_file
+from .error_detection import run_linter_auto_cached, run_linter_batch
 
 # --------------------------------------------------------------------------------
 # OpenAI API Integration and Function Execution
 # --------------------------------------------------------------------------------
 
+# Keywords that route a query through the MCP research path
+MCP_KEYWORDS = (
+    # Research & Documentation
+    "documentation", "docs", "library", "package", "framework", "api reference",
+    "how to use", "tutorial", "guide", "example", "context7", "research",
+    # Crypto & Trading (CCXT server)
+    "price", "btc", "bitcoin", "ethereum", "eth", "crypto", "cryptocurrency",
+    "trading", "exchange", "binance", "coinbase", "kraken", "market", "ccxt", "cctx",
+    # MCP Server mentions
+    "mcp server", "mcp tool", "use mcp", "fetch", "get price", "market data"
+)
+
+# Single alternation compiled once so each message is scanned in one pass
+_MCP_KEYWORDS_RE = re.compile("|".join(map(re.escape, MCP_KEYWORDS)))
+
+# Keywords suggesting an edit is only a formatting tweak
+TRIVIAL_KEYWORDS = (
+    "blank line", "spacing", "whitespace", "indentation",
+    "extra blank", "remove blank", "add blank", "pep 8",
+    "two blank lines", "blank lines between", "trailing whitespace"
+)
+
+_TRIVIAL_KEYWORDS_RE = re.compile("|".join(map(re.escape, TRIVIAL_KEYWORDS)))
+
+# Source of fallback IDs for tool calls streamed without one
+_CALL_IDS = itertools.count()
+
+# MCP query entry point, resolved lazily by _get_query_ai()
+_query_ai = None
+
+# Linter diagnostics appended to tool results; "{}" receives the linter output
+_LINT_TEMPLATE_READ = "\n\n🔍 LINTER DIAGNOSTICS:\n{}\n\n⚠️  ISSUES DETECTED - Please fix these errors/warnings!"
+_LINT_TEMPLATE_CREATE = "\n\n🔍 LINTER DIAGNOSTICS for new file:\n{}\n\n⚠️  ISSUES DETECTED - Consider fixing these errors/warnings!"
+_LINT_TEMPLATE_EDIT = "\n\n🔍 LINTER DIAGNOSTICS after edit:\n{}\n\n⚠️  ISSUES DETECTED - Consider fixing these errors/warnings!"
+# Multi-file creates list each file's diagnostics, then one closing warning
+_LINT_TEMPLATE_CREATE_MANY = "\n\n🔍 LINTER DIAGNOSTICS for new file '{}':\n{}"
+_LINT_ISSUES_FOOTER = "\n\n⚠️  ISSUES DETECTED - Consider fixing these errors/warnings!"
+
+# Divider between the files returned by read_multiple_files
+_FILE_SEPARATOR = "\n\n" + "=" * 50 + "\n\n"
+
+# Tools with no side effects; consecutive calls to these may run concurrently
+_READ_ONLY_TOOLS = frozenset({"read_file", "read_multiple_files"})
+
+# Upper bound on threads used for multi-file reads and writes
+_MAX_IO_WORKERS = 8
+
 # Pydantic AI agent handles MCP tool execution
 def execute_mcp_tool(function_name: str, arguments: dict) -> str:
     """Legacy MCP tool execution - now handled by Pydantic AI agent."""
     return f"Error: Legacy MCP tool execution disabled. Using Pydantic AI agent instead."
 
-def execute_function_call_dict(tool_call_dict) -> str:
-    """Execute a function call from a dictionary format and return the result as a string."""
+def _parse_arguments(tool_call_dict) -> dict:
+    """Parse the JSON arguments of a tool call, returning ``None`` if they are malformed."""
     try:
-        function_name = tool_call_dict["function"]["name"]
-        arguments = json.loads(tool_call_dict["function"]["arguments"])
-        
-        # Check if this is an MCP tool (contains server prefix)
-        if "_" in function_name and function_name not in ["read_file", "create_file", "edit_file", "read_multiple_files", "create_multiple_files"]:
-            return execute_mcp_tool(function_name, arguments)
-        
-        if function_name == "read_file":
-            file_path = arguments["file_path"]
-            normalized_path = normalize_path(file_path)
-            content = read_local_file(normalized_path, with_diagnostics=True)
-            
-            # Add automatic error detection for supported files (Python, JS, TS)
-            error_info = ""
-            if is_supported_file(normalized_path):
-                linter_output = run_linter_auto(normalized_path)
-                if linter_output.strip():
-                    error_info = f"\n\n🔍 LINTER DIAGNOSTICS:\n{linter_output}\n\n⚠️  ISSUES DETECTED - Please fix these errors/warnings!"
-            
-            return f"Content of file '{normalized_path}':\n\n{content}{error_info}"
-            
-        elif function_name == "read_multiple_files":
-            file_paths = arguments["file_paths"]
-            results = []
-            for file_path in file_paths:
-                try:
-                    normalized_path = normalize_path(file_path)
-                    content = read_local_file(normalized_path, with_diagnostics=True)
-                    results.append(f"Content of file '{normalized_path}':\n\n{content}")
-                except OSError as e:
-                    results.append(f"Error reading '{file_path}': {e}")
-            return "\n\n" + "="*50 + "\n\n".join(results)
-            
-        elif function_name == "create_file":
-            file_path = arguments["file_path"]
-            content = arguments["content"]
-            create_file(file_path, content)
-            
-            # Run error detection on newly created files (Python, JS, TS)
-            error_info = ""
-            if is_supported_file(file_path):
-                linter_output = run_linter_auto(file_path)
-                if linter_output.strip():
-                    error_info = f"\n\n🔍 LINTER DIAGNOSTICS for new file:\n{linter_output}\n\n⚠️  ISSUES DETECTED - Consider fixing these errors/warnings!"
-            
-            return f"Successfully created file '{file_path}'{error_info}"
-            
-        elif function_name == "create_multiple_files":
-            files = arguments["files"]
-            created_files = []
-            for file_info in files:
-                create_file(file_info["path"], file_info["content"])
-                created_files.append(file_info["path"])
-            return f"Successfully created {len(created_files)} files: {', '.join(created_files)}"
-            
-        elif function_name == "edit_file":
-            file_path = arguments["file_path"]
-            original_snippet = arguments["original_snippet"]
-            new_snippet = arguments["new_snippet"]
-            
-            # Ensure file is in context first
-            if not ensure_file_in_context(file_path):
-                return f"Error: Could not read file '{file_path}' for editing"
-            
-            apply_diff_edit(file_path, original_snippet, new_snippet)
-            
-            # Run error detection on edited files (Python, JS, TS)
-            error_info = ""
-            if is_supported_file(file_path):
-                linter_output = run_linter_auto(file_path)
-                if linter_output.strip():
-                    error_info = f"\n\n🔍 LINTER DIAGNOSTICS after edit:\n{linter_output}\n\n⚠️  ISSUES DETECTED - Consider fixing these errors/warnings!"
-            
-            return f"Successfully edited file '{file_path}'{error_info}"
-            
-        else:
-            return f"Unknown function: {function_name}"
-            
-    except Exception as e:
-        return f"Error executing {function_name}: {str(e)}"
+        return _json_loads(tool_call_dict["function"]["arguments"])
+    except json.JSONDecodeError:
+        return None
 
-def execute_function_call(tool_call) -> str:
-    """Execute a function call and return the result as a string."""
+def _handle_read_file(arguments: dict) -> str:
+    file_path = arguments["file_path"]
+    normalized_path = normalize_path(file_path)
+    content = read_local_file(normalized_path)
+    
+    # Add automatic error detection for supported files (Python, JS, TS); one
+    # linter run feeds both the inline diagnostics and the summary below
+    error_info = ""
+    linter_output = run_linter_auto_cached(normalized_path, content)
+    content = append_diagnostics(content, normalized_path, linter_output)
+    if linter_output.strip():
+        error_info = _LINT_TEMPLATE_READ.format(linter_output)
+    
+    return f"Content of file '{normalized_path}':\n\n{content}{error_info}"
+
+def _map_io(function, items: list) -> list:
+    """Apply ``function`` to each item on a thread pool, returning results in order.
+
+    File reads and writes release the GIL, so independent files overlap their I/O.
+    """
+    if len(items) <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(_MAX_IO_WORKERS, len(items))) as executor:
+        return list(executor.map(function, items))
+
+def _read_for_batch(file_path: str) -> tuple:
+    """Return ``(normalized_path, content)``, or ``(file_path, error)`` if the read fails."""
     try:
-        function_name = tool_call.function.name
-        arguments = json.loads(tool_call.function.arguments)
-        
-        # Check if this is an MCP tool (contains server prefix)
-        if "_" in function_name and function_name not in ["read_file", "create_file", "edit_file", "read_multiple_files", "create_multiple_files"]:
-            return execute_mcp_tool(function_name, arguments)
-        
-        if function_name == "read_file":
-            file_path = arguments["file_path"]
-            normalized_path = normalize_path(file_path)
-            content = read_local_file(normalized_path, with_diagnostics=True)
-            
-            # Add automatic error detection for supported files (Python, JS, TS)
-            error_info = ""
-            if is_supported_file(normalized_path):
-                linter_output = run_linter_auto(normalized_path)
-                if linter_output.strip():
-                    error_info = f"\n\n🔍 LINTER DIAGNOSTICS:\n{linter_output}\n\n⚠️  ISSUES DETECTED - Please fix these errors/warnings!"
-            
-            return f"Content of file '{normalized_path}':\n\n{content}{error_info}"
-            
-        elif function_name == "read_multiple_files":
-            file_paths = arguments["file_paths"]
-            results = []
-            for file_path in file_paths:
-                try:
-                    normalized_path = normalize_path(file_path)
-                    content = read_local_file(normalized_path, with_diagnostics=True)
-                    results.append(f"Content of file '{normalized_path}':\n\n{content}")
-                except OSError as e:
-                    results.append(f"Error reading '{file_path}': {e}")
-            return "\n\n" + "="*50 + "\n\n".join(results)
-            
-        elif function_name == "create_file":
-            file_path = arguments["file_path"]
-            content = arguments["content"]
-            create_file(file_path, content)
-            
-            # Run error detection on newly created files (Python, JS, TS)
-            error_info = ""
-            if is_supported_file(file_path):
-                linter_output = run_linter_auto(file_path)
-                if linter_output.strip():
-                    error_info = f"\n\n🔍 LINTER DIAGNOSTICS for new file:\n{linter_output}\n\n⚠️  ISSUES DETECTED - Consider fixing these errors/warnings!"
-            
-            return f"Successfully created file '{file_path}'{error_info}"
-            
-        elif function_name == "create_multiple_files":
-            files = arguments["files"]
-            created_files = []
-            for file_info in files:
-                create_file(file_info["path"], file_info["content"])
-                created_files.append(file_info["path"])
-            return f"Successfully created {len(created_files)} files: {', '.join(created_files)}"
-            
-        elif function_name == "edit_file":
-            file_path = arguments["file_path"]
-            original_snippet = arguments["original_snippet"]
-            new_snippet = arguments["new_snippet"]
-            
-            # Ensure file is in context first
-            if not ensure_file_in_context(file_path):
-                return f"Error: Could not read file '{file_path}' for editing"
-            
-            apply_diff_edit(file_path, original_snippet, new_snippet)
-            
-            # Run error detection on edited files (Python, JS, TS)
-            error_info = ""
-            if is_supported_file(file_path):
-                linter_output = run_linter_auto(file_path)
-                if linter_output.strip():
-                    error_info = f"\n\n🔍 LINTER DIAGNOSTICS after edit:\n{linter_output}\n\n⚠️  ISSUES DETECTED - Consider fixing these errors/warnings!"
-            
-            return f"Successfully edited file '{file_path}'{error_info}"
-            
+        normalized_path = normalize_path(file_path)
+        return normalized_path, read_local_file(normalized_path)
+    except OSError as e:
+        return file_path, e
+
+def _handle_read_multiple_files(arguments: dict) -> str:
+    contents = _map_io(_read_for_batch, arguments["file_paths"])
+    
+    # Lint every readable file in one batch instead of one process per file;
+    # unsupported file types are skipped by the batch itself
+    diagnostics = run_linter_batch([
+        path for path, content in contents if not isinstance(content, OSError)
+    ])
+    
+    # Write each piece straight into one buffer rather than building a string per file
+    buffer = io.StringIO()
+    for index, (path, content) in enumerate(contents):
+        if index:
+            buffer.write(_FILE_SEPARATOR)
+        if isinstance(content, OSError):
+            buffer.write(f"Error reading '{path}': {content}")
         else:
-            return f"Unknown function: {function_name}"
-            
+            buffer.write(f"Content of file '{path}':\n\n")
+            buffer.write(append_diagnostics(content, path, diagnostics.get(path, "")))
+    return buffer.getvalue()
+
+def _handle_create_file(arguments: dict) -> str:
+    file_path = arguments["file_path"]
+    content = arguments["content"]
+    create_file(file_path, content)
+    
+    # Run error detection on newly created files (Python, JS, TS)
+    error_info = ""
+    linter_output = run_linter_auto_cached(file_path, content)
+    if linter_output.strip():
+        error_info = _LINT_TEMPLATE_CREATE.format(linter_output)
+    
+    return f"Successfully created file '{file_path}'{error_info}"
+
+def _handle_create_multiple_files(arguments: dict) -> str:
+    # Writes run concurrently, so collapse paths naming the same file first; as with
+    # sequential writes, the last path and content given for a file win
+    files = {
+        normalize_path(file_info["path"]): (file_info["path"], file_info["content"])
+        for file_info in arguments["files"]
+    }
+    _map_io(lambda item: create_file(*item), list(files.values()))
+    created_files = [path for path, _ in files.values()]
+    
+    # Run error detection on all new files with one linter process per language
+    linter_outputs = run_linter_batch(created_files)
+    error_info = "".join(
+        _LINT_TEMPLATE_CREATE_MANY.format(path, output)
+        for path, output in linter_outputs.items() if output.strip()
+    )
+    if error_info:
+        error_info += _LINT_ISSUES_FOOTER
+    
+    return f"Successfully created {len(created_files)} files: {', '.join(created_files)}{error_info}"
+
+def _handle_edit_file(arguments: dict) -> str:
+    file_path = arguments["file_path"]
+    original_snippet = arguments["original_snippet"]
+    new_snippet = arguments["new_snippet"]
+    
+    # Ensure file is in context first
+    if not ensure_file_in_context(file_path):
+        return f"Error: Could not read file '{file_path}' for editing"
+    
+    changed = apply_diff_edit(file_path, original_snippet, new_snippet)
+    
+    # Run error detection on edited files (Python, JS, TS); a no-op edit
+    # leaves nothing new to lint
+    error_info = ""
+    if changed:
+        linter_output = run_linter_auto_cached(file_path)
+        if linter_output.strip():
+            error_info = _LINT_TEMPLATE_EDIT.format(linter_output)
+    
+    return f"Successfully edited file '{file_path}'{error_info}"
+
+# Built-in tool name -> handler taking the parsed arguments
+_HANDLERS = {
+    "read_file": _handle_read_file,
+    "read_multiple_files": _handle_read_multiple_files,
+    "create_file": _handle_create_file,
+    "create_multiple_files": _handle_create_multiple_files,
+    "edit_file": _handle_edit_file,
+}
+
+def _dispatch(function_name: str, arguments: dict) -> str:
+    """Run the tool ``function_name`` with already-parsed ``arguments``."""
+    handler = _HANDLERS.get(function_name)
+    if handler is not None:
+        return handler(arguments)
+    
+    # Check if this is an MCP tool (contains server prefix)
+    if "_" in function_name:
+        return execute_mcp_tool(function_name, arguments)
+    
+    return f"Unknown function: {function_name}"
+
+def execute_function_call_dict(tool_call_dict, arguments: dict = None) -> str:
+    """Execute a function call from a dictionary format and return the result as a string.
+
+    ``arguments`` can be supplied when the caller has already parsed the JSON payload.
+    """
+    function_name = tool_call_dict["function"]["name"]
+    try:
+        if arguments is None:
+            arguments = _json_loads(tool_call_dict["function"]["arguments"])
+        return _dispatch(function_name, arguments)
     except Exception as e:
         return f"Error executing {function_name}: {str(e)}"
 
+def execute_function_call(tool_call) -> str:
+    """Execute a function call and return the result as a string.
+
+    Accepts either a tool call object (as returned by the OpenAI SDK) or its dictionary form.
+    """
+    if not isinstance(tool_call, dict):
+        function = tool_call.function
+        tool_call = {"function": {"name": function.name, "arguments": function.arguments}}
+    return execute_function_call_dict(tool_call)
+
 def stream_openai_response(user_message: str):
     """
     Primary function for AI responses using recursive function calling system.
@@ -218,38 +270,29 @@ def _should_use_mcp(user_message: str) -> bool:
     """
     Determine if the query needs MCP tools for library research, documentation, or external services.
     """
-    mcp_keywords = [
-        # Research & Documentation
-        "documentation", "docs", "library", "package", "framework", "api reference",
-        "how to use", "tutorial", "guide", "example", "context7", "research",
-        # Crypto & Trading (CCXT server)
-        "price", "btc", "bitcoin", "ethereum", "eth", "crypto", "cryptocurrency",
-        "trading", "exchange", "binance", "coinbase", "kraken", "market", "ccxt", "cctx",
-        # MCP Server mentions
-        "mcp server", "mcp tool", "use mcp", "fetch", "get price", "market data"
-    ]
-    
-    message_lower = user_message.lower()
-    return any(keyword in message_lower for keyword in mcp_keywords)
+    return _MCP_KEYWORDS_RE.search(user_message.lower()) is not None
+
+def _get_query_ai():
+    """Import the MCP query entry point on first use and cache it for later calls."""
+    global _query_ai
+    if _query_ai is None:
+        from .pydantic_mcp_integration import query_ai
+        _query_ai = query_ai
+    return _query_ai
 
 def _handle_mcp_enhanced_query(user_message: str):
     """
     Handle queries that need MCP tools with fallback to recursive calling.
     """
     try:
-        from .pydantic_mcp_integration import query_ai
-        
         # Use MCP for research/documentation queries
-        response = query_ai(user_message)
+        response = _get_query_ai()(user_message)
         
         # Add the assistant's response to conversation history
         conversation_history.append({"role": "assistant", "content": response})
         
-        # Stream the response character by character for the UI effect
-        for char in response:
-            console.print(char, end="")
-        
-        console.print()  # New line after streaming
+        # The MCP path is non-streaming, so render the whole response in one write
+        console.print(response, markup=False)
         console.print(f"[dim]✅ Task completed using MCP research tools[/dim]")
         
         return {"success": True}
@@ -264,46 +307,114 @@ def _handle_mcp_enhanced_query(user_message: str):
         return _recursive_function_calling_loop(client, current_model)
 
 
-def _is_trivial_iteration(tool_calls):
+def _strip_whitespace(text: str) -> str:
+    """Remove all whitespace from ``text``.
+
+    ``str.split`` scans in C without building a regex match per run, which matters
+    for multi-KB snippets.
+    """
+    return "".join(text.split())
+
+def _is_trivial_edit(args) -> bool:
+    """Return ``True`` if parsed ``edit_file`` arguments only change spacing/formatting."""
+    try:
+        # Check if the arguments suggest trivial formatting changes
+        original = args.get('original_snippet', '').lower()
+        new = args.get('new_snippet', '').lower()
+    except AttributeError:  # Malformed arguments
+        return False
+    
+    # If the content is very similar and involves spacing/formatting
+    if len(original.strip()) > 0 and len(new.strip()) > 0:
+        # Check if changes are only whitespace/formatting
+        if _strip_whitespace(original) == _strip_whitespace(new):
+            return True
+            
+    # Check for trivial keyword patterns
+    combined_text = original + ' ' + new
+    return _TRIVIAL_KEYWORDS_RE.search(combined_text) is not None
+
+def _is_trivial_iteration(tool_calls, parsed_arguments):
     """
     Detect if the current iteration involves only trivial edits (spacing, formatting, etc.)
     to prevent infinite loops on minor issues.
+
+    An iteration is trivial when it contains at least one ``edit_file`` call and every
+    edit in it is trivial, so one real edit keeps the loop going.
+    ``parsed_arguments`` holds the decoded arguments of each tool call (``None`` when
+    malformed), so the JSON payloads are parsed only once per iteration.
     """
-    if not tool_calls:
-        return False
-    
-    trivial_keywords = [
-        "blank line", "spacing", "whitespace", "indentation",
-        "extra blank", "remove blank", "add blank", "pep 8",
-        "two blank lines", "blank lines between", "trailing whitespace"
+    edits = [
+        args for tool_call, args in zip(tool_calls, parsed_arguments)
+        if tool_call['function']['name'] == 'edit_file'
     ]
-    
-    for tool_call in tool_calls:
-        if tool_call['function']['name'] == 'edit_file':
-            try:
-                # Check if the arguments suggest trivial formatting changes
-                args = json.loads(tool_call['function']['arguments'])
-                original = args.get('original_snippet', '').lower()
-                new = args.get('new_snippet', '').lower()
-                
-                # If the content is very similar and involves spacing/formatting
-                if len(original.strip()) > 0 and len(new.strip()) > 0:
-                    # Check if changes are only whitespace/formatting
-                    original_no_space = ''.join(original.split())
-                    new_no_space = ''.join(new.split())
-                    
-                    if original_no_space == new_no_space:  # Only whitespace changes
-                        return True
-                        
-                # Check for trivial keyword patterns
-                combined_text = (original + ' ' + new).lower()
-                if any(keyword in combined_text for keyword in trivial_keywords):
-                    return True
-                    
-            except (json.JSONDecodeError, KeyError):
-                continue
-    
-    return False
+    return bool(edits) and all(_is_trivial_edit(args) for args in edits)
+
+
+def _new_tool_call_slot() -> dict:
+    """Return an empty accumulator for a streamed tool call.
+
+    Name/argument fragments are collected in lists and joined once after streaming.
+    """
+    return {"id": "", "type": "function", "function": {"name": [], "arguments": []}}
+
+
+def _run_tool_call(call: tuple) -> str:
+    """Execute one ``(tool_call, arguments)`` pair, always returning a tool response."""
+    tool_call, arguments = call
+    try:
+        return execute_function_call_dict(tool_call, arguments)
+    except Exception as e:
+        console.print(f"[red]Error executing {tool_call['function']['name']}: {e}[/red]")
+        # Still need to add a tool response even on error
+        return f"Error: {str(e)}"
+
+def _execute_tool_calls(tool_calls: list, parsed_arguments: list) -> list:
+    """Execute tool calls in order and return their results.
+
+    Consecutive read-only calls run concurrently since they cannot affect each other;
+    any call that writes waits for everything before it, so edits still see prior
+    writes and reads still see prior edits.
+    """
+    results = []
+    pending_reads = []
+    for call in zip(tool_calls, parsed_arguments):
+        if call[0]["function"]["name"] in _READ_ONLY_TOOLS:
+            pending_reads.append(call)
+            continue
+        results.extend(_map_io(_run_tool_call, pending_reads))
+        pending_reads.clear()
+        results.append(_run_tool_call(call))
+    results.extend(_map_io(_run_tool_call, pending_reads))
+    return results
+
+class _StreamBuffer:
+    """Collect streamed text and print it in batches rather than once per token.
+
+    Text is flushed when more than ``max_chars`` are pending or ``interval`` seconds
+    have passed since the last flush, so output still appears to stream live.
+    """
+
+    def __init__(self, interval: float = 0.016, max_chars: int = 256):
+        self.interval = interval
+        self.max_chars = max_chars
+        self.parts = []
+        self.size = 0
+        self.last_flush = time.monotonic()
+
+    def feed(self, text: str) -> None:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size > self.max_chars or time.monotonic() - self.last_flush > self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts:
+            # Model output is plain text; a "[...]" split across batches must not be read as markup
+            console.print("".join(self.parts), end="", markup=False)
+            self.parts.clear()
+            self.size = 0
+        self.last_flush = time.monotonic()
 
 
 def _recursive_function_calling_loop(client, current_model, max_iterations=10):
@@ -321,32 +432,31 @@ def _recursive_function_calling_loop(client, current_model, max_iterations=10):
     iteration = 0
     consecutive_trivial_iterations = 0  # Track trivial edits to prevent infinite loops
     
+    # Request parameters built once for every iteration; conversation_history is
+    # the shared list that grows between requests, so the API always sees it current.
+    base_params = {
+        "model": current_model,
+        "messages": conversation_history,
+        # Use the proper tools from the tools module for recursive function calling
+        "tools": get_all_tools(),
+        "max_completion_tokens": 64000,
+        "stream": True
+    }
+    
+    # Add provider-specific headers and extra body for OpenRouter
+    extra_headers = get_provider_headers()
+    extra_body = get_provider_extra_body()
+    
+    if extra_headers:
+        base_params["extra_headers"] = extra_headers
+    if extra_body:
+        base_params["extra_body"] = extra_body
+    
     while iteration < max_iterations:
         iteration += 1
-        console.print(f"\n[dim]🔄 Iteration {iteration}[/dim]")
-        
-        # Use the proper tools from the tools module for recursive function calling
-        current_tools = tools
-        
-        # Prepare request parameters
-        request_params = {
-            "model": current_model,
-            "messages": conversation_history,
-            "tools": current_tools,
-            "max_completion_tokens": 64000,
-            "stream": True
-        }
-        
-        # Add provider-specific headers and extra body for OpenRouter
-        extra_headers = get_provider_headers()
-        extra_body = get_provider_extra_body()
-        
-        if extra_headers:
-            request_params["extra_headers"] = extra_headers
-        if extra_body:
-            request_params["extra_body"] = extra_body
+        console.print(Text(f"\n🔄 Iteration {iteration}", style="dim"))
 
-        stream = client.chat.completions.create(**request_params)
+        stream = client.chat.completions.create(**base_params)
 
         if iteration == 1:
             console.print("\n[bold bright_blue]🤖 AI Engineer>[/bold bright_blue]")
@@ -354,48 +464,54 @@ def _recursive_function_calling_loop(client, current_model, max_iterations=10):
             console.print("\n[bold bright_blue]🔄 Continuing...[/bold bright_blue]")
             
         reasoning_started = False
-        reasoning_content = ""
-        final_content = ""
+        content_parts = []  # Joined once after streaming
+        output = _StreamBuffer()
         tool_calls = []
 
+        # Resolved once per request rather than once per streamed chunk
+        reasoning_supported = supports_reasoning()
+
         for chunk in stream:
+            delta = chunk.choices[0].delta
             # Handle reasoning content if available (mostly for DeepSeek R1 model)
-            if (supports_reasoning() and
-                hasattr(chunk.choices[0].delta, 'reasoning_content') and
-                chunk.choices[0].delta.reasoning_content):
+            reasoning_delta = getattr(delta, "reasoning_content", None) if reasoning_supported else None
+            if reasoning_delta:
                 if not reasoning_started:
+                    output.flush()
                     console.print("\n[bold blue]💭 Reasoning:[/bold blue]")
                     reasoning_started = True
-                console.print(chunk.choices[0].delta.reasoning_content, end="")
-                reasoning_content += chunk.choices[0].delta.reasoning_content
-            elif chunk.choices[0].delta.content:
+                output.feed(reasoning_delta)
+            elif delta.content:
                 if reasoning_started:
+                    output.flush()
                     console.print("\n")  # Add spacing after reasoning
                     console.print("\n[bold bright_blue]🤖 Assistant>[/bold bright_blue] ", end="")
                     reasoning_started = False
-                final_content += chunk.choices[0].delta.content
-                console.print(chunk.choices[0].delta.content, end="")
-            elif chunk.choices[0].delta.tool_calls:
+                content_parts.append(delta.content)
+                output.feed(delta.content)
+            elif delta.tool_calls:
                 # Handle tool calls
-                for tool_call_delta in chunk.choices[0].delta.tool_calls:
-                    if tool_call_delta.index is not None:
-                        # Ensure we have enough tool_calls
-                        while len(tool_calls) <= tool_call_delta.index:
-                            tool_calls.append({
-                                "id": "",
-                                "type": "function",
-                                "function": {"name": "", "arguments": ""}
-                            })
+                for tool_call_delta in delta.tool_calls:
+                    index = tool_call_delta.index
+                    if index is not None:
+                        # Ensure we have enough tool_calls (indices normally arrive in order)
+                        missing = index + 1 - len(tool_calls)
+                        if missing > 0:
+                            tool_calls.extend(_new_tool_call_slot() for _ in range(missing))
                         
+                        slot = tool_calls[index]
                         if tool_call_delta.id:
-                            tool_calls[tool_call_delta.index]["id"] = tool_call_delta.id
-                        if tool_call_delta.function:
-                            if tool_call_delta.function.name:
-                                tool_calls[tool_call_delta.index]["function"]["name"] += tool_call_delta.function.name
-                            if tool_call_delta.function.arguments:
-                                tool_calls[tool_call_delta.index]["function"]["arguments"] += tool_call_delta.function.arguments
+                            slot["id"] = tool_call_delta.id
+                        function_delta = tool_call_delta.function
+                        if function_delta:
+                            if function_delta.name:
+                                slot["function"]["name"].append(function_delta.name)
+                            if function_delta.arguments:
+                                slot["function"]["arguments"].append(function_delta.arguments)
 
+        output.flush()
         console.print()  # New line after streaming
+        final_content = "".join(content_parts)
 
         # Store the assistant's response in conversation history
         assistant_message = {
@@ -408,18 +524,15 @@ def _recursive_function_calling_loop(client, current_model, max_iterations=10):
             formatted_tool_calls = []
             
             for i, tc in enumerate(tool_calls):
+                tc["function"]["name"] = "".join(tc["function"]["name"])
+                tc["function"]["arguments"] = "".join(tc["function"]["arguments"])
                 if tc["function"]["name"]:  # Only add if we have a function name
                     # Ensure we have a valid tool call ID
-                    tool_id = tc["id"] if tc["id"] else f"call_{i}_{int(time.time() * 1000)}"
+                    if not tc["id"]:
+                        tc["id"] = f"call_{i}_{next(_CALL_IDS):x}"
                     
-                    formatted_tool_calls.append({
-                        "id": tool_id,
-                        "type": "function",
-                        "function": {
-                            "name": tc["function"]["name"],
-                            "arguments": tc["function"]["arguments"]
-                        }
-                    })
+                    # The streamed slot already has the API shape, so store it as-is
+                    formatted_tool_calls.append(tc)
             
             if formatted_tool_calls:
                 # CRITICAL: OpenAI requires content=None when tool_calls are present
@@ -434,11 +547,11 @@ def _recursive_function_calling_loop(client, current_model, max_iterations=10):
                 if user_explanation:
                     console.print(f"\n{user_explanation}")
                 
-                # Execute tool calls and add results immediately
-                console.print(f"\n[bold bright_cyan]⚡ Executing {len(formatted_tool_calls)} function call(s)...[/bold bright_cyan]")
+                # Parse each tool call's arguments once; reused by the trivial check and execution
+                parsed_arguments = [_parse_arguments(tool_call) for tool_call in formatted_tool_calls]
                 
                 # Check if these are trivial edits (spacing, formatting only)
-                is_trivial_iteration = _is_trivial_iteration(formatted_tool_calls)
+                is_trivial_iteration = _is_trivial_iteration(formatted_tool_calls, parsed_arguments)
                 if is_trivial_iteration:
                     consecutive_trivial_iterations += 1
                 else:
@@ -450,28 +563,21 @@ def _recursive_function_calling_loop(client, current_model, max_iterations=10):
                     console.print(f"[dim]✅ Task completed with minor formatting variations after {iteration} iteration(s)[/dim]")
                     break
                 
+                # Announce the batch and every call in it with a single console write
+                execution_summary = Text()
+                execution_summary.append(f"\n⚡ Executing {len(formatted_tool_calls)} function call(s)...", style="bold bright_cyan")
                 for tool_call in formatted_tool_calls:
-                    console.print(f"[bright_blue]→ {tool_call['function']['name']}[/bright_blue]")
-                    
-                    try:
-                        result = execute_function_call_dict(tool_call)
-                        
-                        # Add tool result to conversation immediately
-                        tool_response = {
-                            "role": "tool",
-                            "tool_call_id": tool_call["id"],
-                            "content": result
-                        }
-                        conversation_history.append(tool_response)
-                    except Exception as e:
-                        console.print(f"[red]Error executing {tool_call['function']['name']}: {e}[/red]")
-                        # Still need to add a tool response even on error
-                        error_response = {
-                            "role": "tool",
-                            "tool_call_id": tool_call["id"],
-                            "content": f"Error: {str(e)}"
-                        }
-                        conversation_history.append(error_response)
+                    execution_summary.append(f"\n→ {tool_call['function']['name']}", style="bright_blue")
+                console.print(execution_summary)
+                
+                # Execute tool calls and add results in call order
+                results = _execute_tool_calls(formatted_tool_calls, parsed_arguments)
+                for tool_call, result in zip(formatted_tool_calls, results):
+                    conversation_history.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call["id"],
+                        "content": result
+                    })
                 
                 # Continue the loop to check for more function calls
                 console.print(f"[dim]✅ Function calls completed. Checking for additional actions...[/dim]")
@@ -10,8 +10,7 @@ from prompt_toolkit.styles import Style as PromptStyle
 from .providers import (
     DEFAULT_MODEL, 
     get_model_config, 
-    get_provider_config, 
-    is_valid_model
+    get_provider_config
 )
 
 # --------------------------------------------------------------------------------
@@ -26,7 +25,7 @@ def get_configured_model() -> str:
     """Get the configured model from environment variables."""
     # Check if specific model is configured
     env_model = os.getenv("LLM_MODEL")
-    if env_model and is_valid_model(env_model):
+    if env_model and get_model_config(env_model) is not None:
         return env_model
     
     # Check if provider is configured and use default model for that provider
@@ -42,6 +41,12 @@ def get_configured_model() -> str:
 # Current model (can be changed at runtime)
 current_model = get_configured_model()
 
+# Bumped by set_current_model() so callers can cache per-model state cheaply
+_model_version = 0
+
+# MCP server configuration file, relative to the working directory
+MCP_CONFIG_PATH = "mcp.config.json"
+
 # Initialize Rich console
 console = Console()
 
@@ -91,22 +96,44 @@ def get_current_model() -> str:
     return current_model
 
 
+def get_model_version() -> int:
+    """Return a counter that changes whenever the current model is switched."""
+    return _model_version
+
+
+# (model name, model config, provider config) for the current model, resolved lazily
+_current_configs = None
+
+
+def _get_current_configs() -> tuple:
+    """Return the ``(model_config, provider_config)`` pair for the current model.
+
+    Either may be ``None`` for an unknown model/provider. The pair is resolved once
+    per model and reused until the current model changes.
+    """
+    global _current_configs
+    if _current_configs is None or _current_configs[0] != current_model:
+        model_config = get_model_config(current_model)
+        provider_config = get_provider_config(model_config.provider) if model_config else None
+        _current_configs = (current_model, model_config, provider_config)
+    return _current_configs[1:]
+
+
 def set_current_model(model_name: str) -> bool:
     """Set the current model if it's valid."""
-    global current_model
-    if is_valid_model(model_name):
-        current_model = model_name
-        return True
-    return False
+    global current_model, _current_configs, _model_version
+    model_config = get_model_config(model_name)
+    if model_config is None:
+        return False
+    current_model = model_name
+    _model_version += 1
+    _current_configs = (model_name, model_config, get_provider_config(model_config.provider))
+    return True
 
 
 def get_provider_headers() -> dict:
     """Get provider-specific headers for the current model."""
-    model_config = get_model_config(current_model)
-    if not model_config:
-        return {}
-    
-    provider_config = get_provider_config(model_config.provider)
+    _, provider_config = _get_current_configs()
     if not provider_config or not provider_config.extra_headers:
         return {}
     
@@ -115,11 +142,7 @@ def get_provider_headers() -> dict:
 
 def get_provider_extra_body() -> dict:
     """Get provider-specific extra body for the current model."""
-    model_config = get_model_config(current_model)
-    if not model_config:
-        return {}
-    
-    provider_config = get_provider_config(model_config.provider)
+    _, provider_config = _get_current_configs()
     if not provider_config or not provider_config.extra_body:
         return {}
     
@@ -128,13 +151,13 @@ def get_provider_extra_body() -> dict:
 
 def supports_reasoning() -> bool:
     """Check if the current model supports reasoning content."""
-    model_config = get_model_config(current_model)
+    model_config, _ = _get_current_configs()
     return model_config.supports_reasoning if model_config else False
 
 
 def get_current_provider() -> str:
     """Get the current provider name."""
-    model_config = get_model_config(current_model)
+    model_config, _ = _get_current_configs()
     return model_config.provider if model_config else "unknown"
 
 
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+from collections import deque
+
 from .prompts import system_PROMPT
 
 # --------------------------------------------------------------------------------
@@ -11,19 +13,38 @@ conversation_history = [
     {"role": "system", "content": system_PROMPT}
 ]
 
+# Normalized paths whose content was added as a system message. System messages
+# survive trimming, so an indexed file stays in context for the whole session.
+_files_in_context = set()
+
+def add_file_to_context(normalized_path: str, content: str) -> None:
+    """Append the content of ``normalized_path`` to the history as a system message."""
+    add_files_to_context([(normalized_path, content)])
+
+def add_files_to_context(files: list) -> None:
+    """Append a system message for each ``(normalized_path, content)`` pair in one extend."""
+    conversation_history.extend(
+        {"role": "system", "content": f"Content of file '{path}':\n\n{content}"}
+        for path, content in files
+    )
+    _files_in_context.update(path for path, _ in files)
+
+def is_file_in_context(normalized_path: str) -> bool:
+    """Return ``True`` if the content of ``normalized_path`` was already added to the history."""
+    return normalized_path in _files_in_context
+
 def trim_conversation_history():
     """Trim conversation history to prevent token limit issues while preserving tool call sequences"""
     if len(conversation_history) <= 20:  # Don't trim if conversation is still small
         return
         
-    # Always keep the system prompt
-    system_msgs = [msg for msg in conversation_history if msg["role"] == "system"]
-    other_msgs = [msg for msg in conversation_history if msg["role"] != "system"]
-    
-    # Keep only the last 15 messages to prevent token overflow
-    if len(other_msgs) > 15:
-        other_msgs = other_msgs[-15:]
+    # Always keep the system prompt; split in one pass, keeping only the last
+    # 15 other messages to prevent token overflow
+    system_msgs = []
+    other_msgs = deque(maxlen=15)
+    for msg in conversation_history:
+        (system_msgs if msg["role"] == "system" else other_msgs).append(msg)
     
     # Rebuild conversation history
-    conversation_history.clear()
-    conversation_history.extend(system_msgs + other_msgs)
\ No newline at end of file
+    conversation_history[:] = system_msgs
+    conversation_history.extend(other_msgs)
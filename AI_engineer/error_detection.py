@@ -7,31 +7,75 @@ return diagnostic messages. Supports Python, JavaScript, and TypeScript files
 with their respective linters (flake8, eslint, tsc).
 """
 
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
+import hashlib
+import os
+import re
+import shutil
 import subprocess
+import threading
+import time
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+# File extensions handled by each linter
+_PYTHON_EXTENSIONS = (".py",)
+_JAVASCRIPT_EXTENSIONS = (".js", ".jsx")
+_TYPESCRIPT_EXTENSIONS = (".ts", ".tsx")
+_SUPPORTED_EXTENSIONS = _PYTHON_EXTENSIONS + _JAVASCRIPT_EXTENSIONS + _TYPESCRIPT_EXTENSIONS
+
+# Diagnostics beyond this many lines per file are summarized rather than returned;
+# they end up in the conversation history and every later prompt
+_MAX_OUTPUT_LINES = 50
+
+# Location prefixes used to route batched linter output back to each file
+_FLAKE8_LOCATION_RE = re.compile(r"^(.+?):\d+:\d+:")
+_ESLINT_LOCATION_RE = re.compile(r"^(.+?): line \d+, col \d+,")
+_TSC_LOCATION_RE = re.compile(r"^(.+?)\(\d+,\d+\):")
+
+# Linter output keyed by (path as given, content digest), least recently used first.
+# The path is not resolved because linters echo it back in their diagnostics.
+_LINT_CACHE = OrderedDict()
+_LINT_CACHE_LOCK = threading.Lock()  # Tool calls may lint from several threads
+
+# Path -> ((st_mtime_ns, st_size), cache key) from the last time it was read from disk
+_FILE_SIGNATURES = {}
+# Files modified this recently are always re-hashed: a same-size rewrite within
+# the filesystem's timestamp granularity would otherwise keep a stale key.
+_RACY_MTIME_WINDOW_NS = 2_000_000_000
+_LINT_CACHE_MAX_ENTRIES = 512
+
+# Output caused by the environment rather than the file; never cached so that
+# installing a missing linter or fixing its config takes effect immediately
+_UNCACHEABLE_MARKERS = ("[Linter Error]", "[ESLint Error]", "[TypeScript Error]", "[ESLint Config]")
 
 
 def is_python_file(file_path: str) -> bool:
     """Return ``True`` if ``file_path`` points to a Python source file."""
-    return file_path.endswith(".py")
+    return file_path.endswith(_PYTHON_EXTENSIONS)
 
 
 def is_javascript_file(file_path: str) -> bool:
     """Return ``True`` if ``file_path`` points to a JavaScript source file."""
-    return file_path.endswith((".js", ".jsx"))
+    return file_path.endswith(_JAVASCRIPT_EXTENSIONS)
 
 
 def is_typescript_file(file_path: str) -> bool:
     """Return ``True`` if ``file_path`` points to a TypeScript source file."""
-    return file_path.endswith((".ts", ".tsx"))
+    return file_path.endswith(_TYPESCRIPT_EXTENSIONS)
 
 
 def run_flake8(file_path: str) -> str:
     """Run ``flake8`` on ``file_path`` and return its diagnostic output."""
+    return _run_flake8([file_path])
+
+
+def _run_flake8(file_paths: list) -> str:
     try:
         result = subprocess.run(
-            ["flake8", file_path],
+            ["flake8", *file_paths],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             encoding="utf-8",
@@ -39,15 +83,30 @@ def run_flake8(file_path: str) -> str:
         )
         return result.stdout.strip()
     except Exception as e:  # pragma: no cover - best effort
-        return f"[Linter Error] Could not check file {file_path}: {e}"
+        return f"[Linter Error] Could not check file {', '.join(file_paths)}: {e}"
 
 
 def run_eslint(file_path: str) -> str:
     """Run ``eslint`` on ``file_path`` and return its diagnostic output."""
+    return _run_eslint([file_path])
+
+
+@lru_cache(maxsize=None)
+def _eslint_command() -> tuple:
+    """Return the command prefix used to run ESLint.
+
+    ``eslint_d`` keeps ESLint loaded in a background daemon (restarting it as
+    needed), so when it is installed each lint skips Node and ESLint startup.
+    """
+    eslint_d = shutil.which("eslint_d")
+    return (eslint_d,) if eslint_d else ("npx", "eslint")
+
+
+def _run_eslint(file_paths: list) -> str:
     try:
         # Try to run eslint with JSON format for better parsing
         result = subprocess.run(
-            ["npx", "eslint", "--format", "compact", file_path],
+            [*_eslint_command(), "--format", "compact", *file_paths],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             encoding="utf-8",
@@ -68,15 +127,19 @@ def run_eslint(file_path: str) -> str:
     except FileNotFoundError:
         return "[ESLint Error] ESLint not found. Install with: npm install -g eslint"
     except Exception as e:
-        return f"[Linter Error] Could not check file {file_path}: {e}"
+        return f"[Linter Error] Could not check file {', '.join(file_paths)}: {e}"
 
 
 def run_typescript_check(file_path: str) -> str:
     """Run TypeScript compiler check on ``file_path`` and return diagnostics."""
+    return _run_typescript_check([file_path])
+
+
+def _run_typescript_check(file_paths: list) -> str:
     try:
         # Use tsc --noEmit to check for type errors without generating files
         result = subprocess.run(
-            ["npx", "tsc", "--noEmit", "--skipLibCheck", file_path],
+            ["npx", "tsc", "--noEmit", "--skipLibCheck", *file_paths],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             encoding="utf-8",
@@ -97,43 +160,204 @@ def run_typescript_check(file_path: str) -> str:
     except FileNotFoundError:
         return "[TypeScript Error] TypeScript compiler not found. Install with: npm install -g typescript"
     except Exception as e:
-        return f"[Linter Error] Could not check file {file_path}: {e}"
+        return f"[Linter Error] Could not check file {', '.join(file_paths)}: {e}"
+
+
+def _combine_typescript_output(ts_output: str, eslint_output: str) -> str:
+    """Merge ``tsc`` and ``eslint`` diagnostics for a TypeScript file."""
+    combined_output = ""
+    if ts_output.strip():
+        combined_output += f"TypeScript Compiler:\n{ts_output}"
+    if eslint_output.strip():
+        if combined_output:
+            combined_output += "\n\n"
+        combined_output += f"ESLint:\n{eslint_output}"
+        
+    return combined_output
+
+
+def _run_typescript_linters(file_path: str) -> str:
+    """Run both the TypeScript compiler and ESLint on ``file_path``."""
+    # The two processes are independent, so tsc runs in the background while
+    # ESLint runs here and the wait is the slower of the two rather than their sum
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        ts_future = executor.submit(run_typescript_check, file_path)
+        eslint_output = run_eslint(file_path)
+        ts_output = ts_future.result()
+    return _combine_typescript_output(ts_output, eslint_output)
+
+
+# File extension -> linter runner returning the diagnostics for one file
+_LINTERS_BY_EXTENSION = {
+    **dict.fromkeys(_PYTHON_EXTENSIONS, run_flake8),
+    **dict.fromkeys(_JAVASCRIPT_EXTENSIONS, run_eslint),
+    **dict.fromkeys(_TYPESCRIPT_EXTENSIONS, _run_typescript_linters),
+}
+
+
+def _truncate_output(output: str, max_lines: int = _MAX_OUTPUT_LINES) -> str:
+    """Keep the first ``max_lines`` lines of ``output``, noting how many were dropped."""
+    lines = output.splitlines()
+    if len(lines) <= max_lines:
+        return output
+    return "\n".join(lines[:max_lines]) + f"\n... ({len(lines) - max_lines} more lines)"
 
 
 def run_linter_auto(file_path: str) -> str:
     """Run the appropriate linter for ``file_path`` and return diagnostics."""
-    path = Path(file_path)
-    file_name = path.name
+    linter = _LINTERS_BY_EXTENSION.get(os.path.splitext(file_path)[1])
+    if linter is None:
+        # No linter available for this file type
+        return ""
+    return _truncate_output(linter(str(Path(file_path))))
+
+
+def _lint_cache_key(file_path: str, content=None):
+    """Return the cache key for ``file_path`` holding ``content`` (read from disk if ``None``).
+
+    When reading from disk, a file whose modification time and size match the last
+    read reuses that key without re-reading or re-hashing the content, unless it
+    was modified too recently for its timestamp to be trusted.
+    """
+    if content is None:
+        try:
+            stat = os.stat(file_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if time.time_ns() - stat.st_mtime_ns >= _RACY_MTIME_WINDOW_NS:
+                with _LINT_CACHE_LOCK:
+                    known = _FILE_SIGNATURES.get(file_path)
+                if known is not None and known[0] == signature:
+                    return known[1]
+            content = Path(file_path).read_bytes()
+        except OSError:
+            return None
+        key = file_path, hashlib.blake2b(content, digest_size=16).digest()
+        with _LINT_CACHE_LOCK:
+            _FILE_SIGNATURES[file_path] = (signature, key)
+        return key
+    elif isinstance(content, str):
+        content = content.encode("utf-8")
+    return file_path, hashlib.blake2b(content, digest_size=16).digest()
+
+
+def _lint_cache_get(key):
+    """Return cached linter output for ``key``, or ``None`` on a miss."""
+    if key is None:
+        return None
+    with _LINT_CACHE_LOCK:
+        output = _LINT_CACHE.get(key)
+        if output is not None:
+            _LINT_CACHE.move_to_end(key)
+    return output
+
+
+def _lint_cache_put(key, output: str) -> None:
+    """Remember ``output`` for ``key``, evicting the least recently used entry."""
+    if key is None or any(marker in output for marker in _UNCACHEABLE_MARKERS):
+        return
+    with _LINT_CACHE_LOCK:
+        _LINT_CACHE[key] = output
+        _LINT_CACHE.move_to_end(key)
+        if len(_LINT_CACHE) > _LINT_CACHE_MAX_ENTRIES:
+            _LINT_CACHE.popitem(last=False)
+
+
+def run_linter_auto_cached(file_path: str, content=None) -> str:
+    """Like ``run_linter_auto`` but skip the linter when the file content was linted before.
+
+    ``content`` (``str`` or ``bytes``) can be passed when the caller already holds the
+    file's content, avoiding a re-read to compute the cache key.
+    """
+    if not is_supported_file(file_path):
+        return ""
+    key = _lint_cache_key(file_path, content)
+    output = _lint_cache_get(key)
+    if output is None:
+        output = run_linter_auto(file_path)
+        _lint_cache_put(key, output)
+    return output
+
+
+def _split_by_file(output: str, file_paths: list, location_re: re.Pattern) -> dict:
+    """Route the output of a batched linter run back to the file each line refers to.
+
+    Indented lines continue the previous diagnostic. Output that cannot be attributed
+    to any file (e.g. a missing linter) is reported for every file.
+    """
+    keys = {os.path.realpath(p): p for p in file_paths}
+    per_file = {p: [] for p in file_paths}
+    matched = False
+    current = None
+    for line in output.splitlines():
+        match = location_re.match(line)
+        if match:
+            current = keys.get(os.path.realpath(match.group(1)))
+            matched = matched or current is not None
+        elif not line[:1].isspace():
+            current = None
+        if current is not None:
+            per_file[current].append(line)
+
+    if not matched and output.strip():
+        return {p: output for p in file_paths}
+    return {p: "\n".join(lines) for p, lines in per_file.items()}
+
+
+def run_linter_batch(file_paths: list) -> dict:
+    """Lint several files at once, spawning one process per linter instead of per file.
+
+    Returns a mapping of every supported path in ``file_paths`` to its diagnostics,
+    formatted the same way as ``run_linter_auto``.
+    """
+    # Only files whose content has not been linted before need a linter run
+    keys = {p: _lint_cache_key(p) for p in file_paths if is_supported_file(p)}
+    cached = {p: _lint_cache_get(key) for p, key in keys.items()}
+    results = _run_linter_batch([p for p, output in cached.items() if output is None])
+    for path, output in results.items():
+        results[path] = output = _truncate_output(output)
+        _lint_cache_put(keys[path], output)
+    return {p: cached[p] if cached[p] is not None else results[p] for p in keys}
+
+
+def _run_linter_batch(file_paths: list) -> dict:
+    python_paths = [p for p in file_paths if is_python_file(p)]
+    javascript_paths = [p for p in file_paths if is_javascript_file(p)]
+    typescript_paths = [p for p in file_paths if is_typescript_file(p)]
     
-    if is_python_file(file_name):
-        return run_flake8(str(path))
-    elif is_javascript_file(file_name):
-        return run_eslint(str(path))
-    elif is_typescript_file(file_name):
-        # For TypeScript files, run both TypeScript compiler and ESLint
-        ts_output = run_typescript_check(str(path))
-        eslint_output = run_eslint(str(path))
+    # Each linter is a separate process, so run them side by side
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        flake8_future = executor.submit(_run_flake8, python_paths) if python_paths else None
         
-        combined_output = ""
-        if ts_output.strip():
-            combined_output += f"TypeScript Compiler:\n{ts_output}"
-        if eslint_output.strip():
-            if combined_output:
-                combined_output += "\n\n"
-            combined_output += f"ESLint:\n{eslint_output}"
-            
-        return combined_output
+        # ESLint handles JavaScript and TypeScript in the same run
+        eslint_paths = javascript_paths + typescript_paths
+        eslint_future = executor.submit(_run_eslint, eslint_paths) if eslint_paths else None
+        tsc_future = (
+            executor.submit(_run_typescript_check, typescript_paths) if typescript_paths else None
+        )
+    
+    results = {}
+    if flake8_future:
+        results.update(_split_by_file(flake8_future.result(), python_paths, _FLAKE8_LOCATION_RE))
+    
+    if eslint_future:
+        eslint_results = _split_by_file(eslint_future.result(), eslint_paths, _ESLINT_LOCATION_RE)
+        for path in javascript_paths:
+            results[path] = eslint_results[path]
+        
+        if tsc_future:
+            ts_results = _split_by_file(tsc_future.result(), typescript_paths, _TSC_LOCATION_RE)
+            for path in typescript_paths:
+                results[path] = _combine_typescript_output(ts_results[path], eslint_results[path])
     
-    # No linter available for this file type
-    return ""
+    return results
 
 
 def get_supported_extensions() -> list:
     """Return a list of file extensions supported by the error detection system."""
-    return [".py", ".js", ".jsx", ".ts", ".tsx"]
+    return list(_SUPPORTED_EXTENSIONS)
 
 
 def is_supported_file(file_path: str) -> bool:
     """Return ``True`` if the file type is supported by the error detection system."""
-    return any(file_path.endswith(ext) for ext in get_supported_extensions())
+    return file_path.endswith(_SUPPORTED_EXTENSIONS)
 
@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 
 import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List
-from rich.table import Table
-from rich.panel import Panel
 
 from .error_detection import run_linter_auto
 
@@ -21,18 +23,21 @@ def read_local_file(file_path: str, with_diagnostics: bool = False) -> str:
     If ``with_diagnostics`` is ``True`` the appropriate linter will be run and
     its output appended to the returned content.
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    content = _read_if_text(file_path, peek_size=0)
 
     if with_diagnostics:
-        diagnostics = run_linter_auto(file_path)
-        if diagnostics:
-            content += (
-                f"\n\n# Linter diagnostics for {file_path}:\n{diagnostics}\n"
-            )
+        content = append_diagnostics(content, file_path, run_linter_auto(file_path))
 
     return content
 
+def append_diagnostics(content: str, file_path: str, diagnostics: str) -> str:
+    """Append linter ``diagnostics`` for ``file_path`` to ``content`` if there are any."""
+    if diagnostics:
+        content += (
+            f"\n\n# Linter diagnostics for {file_path}:\n{diagnostics}\n"
+        )
+    return content
+
 def create_file(path: str, content: str):
     """Create (or overwrite) a file at 'path' with the given 'content'."""
     file_path = Path(path)
@@ -46,15 +51,22 @@ def create_file(path: str, content: str):
     if len(content) > 5_000_000:  # 5MB limit
         raise ValueError("File content exceeds 5MB size limit")
     
+    # Encode once and write the bytes directly, skipping the text layer's encoder
+    data = content.encode("utf-8")
+    if os.linesep != "\n":  # Keep the newline translation text mode would apply
+        data = data.replace(b"\n", os.linesep.encode())
+    
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    with open(file_path, "wb") as f:
+        f.write(data)
     console.print(f"[bold blue]✓[/bold blue] Created/updated file at '[bright_cyan]{file_path}[/bright_cyan]'")
 
 def show_diff_table(files_to_edit: List[FileToEdit]) -> None:
     if not files_to_edit:
         return
     
+    from rich.table import Table
+    
     table = Table(title="📝 Proposed Edits", show_header=True, header_style="bold bright_blue", show_lines=True, border_style="blue")
     table.add_column("File Path", style="bright_cyan", no_wrap=True)
     table.add_column("Original", style="red dim")
@@ -65,58 +77,76 @@ def show_diff_table(files_to_edit: List[FileToEdit]) -> None:
     
     console.print(table)
 
-def apply_diff_edit(path: str, original_snippet: str, new_snippet: str):
-    """Reads the file at 'path', replaces the first occurrence of 'original_snippet' with 'new_snippet', then overwrites."""
+def apply_diff_edit(path: str, original_snippet: str, new_snippet: str) -> bool:
+    """Reads the file at 'path', replaces the first occurrence of 'original_snippet' with 'new_snippet', then overwrites.
+
+    Returns ``True`` only if the file content actually changed.
+    """
     try:
         content = read_local_file(path)
         
-        # Verify we're replacing the exact intended occurrence
-        occurrences = content.count(original_snippet)
-        if occurrences == 0:
+        # Verify we're replacing the exact intended occurrence; a second find stops at
+        # the first extra match, and the full count is only needed to report one
+        start = content.find(original_snippet)
+        if start < 0:
             raise ValueError("Original snippet not found")
-        if occurrences > 1:
+        end = start + len(original_snippet)
+        if content.find(original_snippet, end) >= 0:
+            occurrences = content.count(original_snippet)
             console.print(f"[bold yellow]⚠ Multiple matches ({occurrences}) found - requiring line numbers for safety[/bold yellow]")
             console.print("[dim]Use format:\n--- original.py (lines X-Y)\n+++ modified.py[/dim]")
             raise ValueError(f"Ambiguous edit: {occurrences} matches")
         
-        updated_content = content.replace(original_snippet, new_snippet, 1)
+        updated_content = content[:start] + new_snippet + content[end:]
+        if updated_content == content:
+            console.print(f"[dim]No changes needed in '{path}'[/dim]")
+            return False
         create_file(path, updated_content)
         console.print(f"[bold blue]✓[/bold blue] Applied diff edit to '[bright_cyan]{path}[/bright_cyan]'")
+        return True
 
     except FileNotFoundError:
         console.print(f"[bold red]✗[/bold red] File not found for diff editing: '[bright_cyan]{path}[/bright_cyan]'")
+        return False
     except ValueError as e:
+        from rich.panel import Panel
+        
         console.print(f"[bold yellow]⚠[/bold yellow] {str(e)} in '[bright_cyan]{path}[/bright_cyan]'. No changes made.")
         console.print("\n[bold blue]Expected snippet:[/bold blue]")
         console.print(Panel(original_snippet, title="Expected", border_style="blue", title_align="left"))
         console.print("\n[bold blue]Actual file content:[/bold blue]")
         console.print(Panel(content, title="Actual", border_style="yellow", title_align="left"))
+        return False
 
 def is_binary_file(file_path: str, peek_size: int = 1024) -> bool:
     try:
-        with open(file_path, 'rb') as f:
-            chunk = f.read(peek_size)
+        # Plain descriptor reads skip building a buffered file object for a 1 KB peek
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            chunk = os.read(fd, peek_size)
+        finally:
+            os.close(fd)
         # If there is a null byte in the sample, treat it as binary
-        if b'\0' in chunk:
-            return True
-        return False
+        return b'\0' in chunk
     except Exception:
         # If we fail to read, just treat it as binary to be safe
         return True
 
 def ensure_file_in_context(file_path: str) -> bool:
     """Ensure a file is in the conversation context."""
-    from .conversation import conversation_history
+    from .conversation import add_file_to_context, conversation_history, is_file_in_context
     
     try:
         normalized_path = normalize_path(file_path)
         content = read_local_file(normalized_path)
+        if is_file_in_context(normalized_path):
+            return True
+        # read_file tool results carry the same marker but are not indexed;
+        # assistant messages with tool calls have None content.
         file_marker = f"Content of file '{normalized_path}'"
-        if not any(file_marker in msg["content"] for msg in conversation_history):
-            conversation_history.append({
-                "role": "system",
-                "content": f"{file_marker}:\n\n{content}"
-            })
+        if not any(file_marker in (msg.get("content") or "")
+                   for msg in conversation_history if msg["role"] != "system"):
+            add_file_to_context(normalized_path, content)
         return True
     except OSError:
         console.print(f"[bold red]✗[/bold red] Could not read file '[bright_cyan]{file_path}[/bright_cyan]' for editing context")
@@ -124,6 +154,18 @@ def ensure_file_in_context(file_path: str) -> bool:
 
 def normalize_path(path_str: str) -> str:
     """Return a canonical, absolute version of the path with security checks."""
+    # Relative paths resolve against the working directory, so it is part of the
+    # cache key; a later chdir can never return a path resolved elsewhere
+    cwd = None if os.path.isabs(path_str) else os.getcwd()
+    return _normalize_path_cached(path_str, cwd)
+
+@lru_cache(maxsize=4096)
+def _normalize_path_cached(path_str: str, cwd) -> str:
+    """Resolve ``path_str`` (relative to ``cwd`` when not absolute), memoized.
+
+    Safe to cache: the traversal check runs on the resolved path, and rejected
+    paths raise, which ``lru_cache`` never stores.
+    """
     path = Path(path_str).resolve()
     
     # Prevent directory traversal attacks
@@ -132,120 +174,224 @@ def normalize_path(path_str: str) -> str:
     
     return str(path)
 
+# File and directory names never added with /add
+EXCLUDED_FILES = frozenset({
+    # Python specific
+    ".DS_Store", "Thumbs.db", ".gitignore", ".python-version",
+    "uv.lock", ".uv", "uvenv", ".uvenv", ".venv", "venv",
+    "__pycache__", ".pytest_cache", ".coverage", ".mypy_cache",
+    # Node.js / Web specific
+    "node_modules", "package-lock.json", "yarn.lock", "pnpm-lock.yaml",
+    ".next", ".nuxt", "dist", "build", ".cache", ".parcel-cache",
+    ".turbo", ".vercel", ".output", ".contentlayer",
+    # Build outputs
+    "out", "coverage", ".nyc_output", "storybook-static",
+    # Environment and config
+    ".env", ".env.local", ".env.development", ".env.production",
+    # Misc
+    ".git", ".svn", ".hg", "CVS"
+})
+
+# File extensions never added with /add
+EXCLUDED_EXTENSIONS = frozenset({
+    # Binary and media files
+    ".png", ".jpg", ".jpeg", ".gif", ".ico", ".svg", ".webp", ".avif",
+    ".mp4", ".webm", ".mov", ".mp3", ".wav", ".ogg",
+    ".zip", ".tar", ".gz", ".7z", ".rar",
+    ".exe", ".dll", ".so", ".dylib", ".bin",
+    # Documents
+    ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
+    # Python specific
+    ".pyc", ".pyo", ".pyd", ".egg", ".whl",
+    # UV specific
+    ".uv", ".uvenv",
+    # Database and logs
+    ".db", ".sqlite", ".sqlite3", ".log",
+    # IDE specific
+    ".idea", ".vscode",
+    # Web specific
+    ".map", ".chunk.js", ".chunk.css",
+    ".min.js", ".min.css", ".bundle.js", ".bundle.css",
+    # Cache and temp files
+    ".cache", ".tmp", ".temp",
+    # Font files
+    ".ttf", ".otf", ".woff", ".woff2", ".eot"
+})
+
+def _available_cpus() -> int:
+    """Return the number of CPUs this process may run on (respecting container/affinity limits)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+# Bounds on how many directory file reads may be in flight ahead of the scan
+_DIRECTORY_READ_AHEAD_MIN = 8
+_DIRECTORY_READ_AHEAD_MAX = 256
+# Reads release the GIL and mostly wait on the disk, so use several threads per CPU
+_DIRECTORY_READ_WORKERS = min(32, _available_cpus() * 4)
+
+def _iter_directory_files(directory_path: str, skipped_files: list, status):
+    """Yield a ``DirEntry`` for each file under ``directory_path`` worth reading.
+
+    Walks top-down like ``os.walk`` (a directory's files before its subdirectories,
+    symlinked directories not followed, unreadable directories ignored) but with
+    ``os.scandir`` directly, so each entry carries its own path and cached type/stat
+    information. Excluded files are recorded in ``skipped_files``.
+    """
+    status.update(f"[bold bright_blue]🔍 Scanning {directory_path}...[/bold bright_blue]")
+    try:
+        with os.scandir(directory_path) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    subdirectories = []
+    for entry in entries:
+        name = entry.name
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            # Skip hidden directories and excluded directories
+            if not name.startswith('.') and name not in EXCLUDED_FILES and not entry.is_symlink():
+                subdirectories.append(entry.path)
+            continue
+
+        dot = name.rfind('.')
+        if (
+            name.startswith('.') or name in EXCLUDED_FILES
+            or (dot > 0 and name[dot:].lower() in EXCLUDED_EXTENSIONS)
+        ):
+            skipped_files.append(entry.path)
+            continue
+
+        yield entry
+
+    for subdirectory in subdirectories:
+        yield from _iter_directory_files(subdirectory, skipped_files, status)
+
+# Per-thread scratch buffer reused for file reads. Buffers up to the size below are
+# kept for the thread's lifetime; larger files get a one-off buffer instead.
+_read_buffers = threading.local()
+_MAX_POOLED_BUFFER = 1 << 20
+
+def _read_if_text(file_path: str, size: int = None, peek_size: int = 1024):
+    """Read the UTF-8 text file ``file_path`` (expected ``size`` bytes) via a reused buffer.
+
+    The bytes are decoded once, straight from the buffer, into the final string.
+    Returns ``None`` if a null byte appears in the first ``peek_size`` bytes, the
+    same probe as ``is_binary_file`` but on the bytes already read, so the file is
+    opened once (``peek_size=0`` disables it). Newlines are translated as text-mode
+    reads do.
+    """
+    with open(file_path, "rb") as f:
+        if size is None:
+            size = os.fstat(f.fileno()).st_size
+        buffer = getattr(_read_buffers, "buffer", None)
+        if buffer is None or len(buffer) <= size:
+            buffer = bytearray(max(size + 1, 64 * 1024))
+            if size < _MAX_POOLED_BUFFER:
+                _read_buffers.buffer = buffer
+        with memoryview(buffer) as view:
+            length = f.readinto(view[:size + 1])
+            # If there is a null byte in the sample, treat it as binary
+            if buffer.find(b"\0", 0, min(length, peek_size)) != -1:
+                return None
+            if length > size:  # The file grew since it was sized
+                text = str(bytes(view[:length]) + f.read(), "utf-8")
+            else:
+                text = str(view[:length], "utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def _load_directory_file(entry: os.DirEntry, max_file_size: int) -> tuple:
+    """Read a file found while adding a directory.
+
+    Returns ``(normalized_path, content)``, or ``(skip_entry, None)`` if the file is skipped.
+    """
+    full_path = entry.path
+    try:
+        # Check file size before processing (cached on the entry where the OS provides it)
+        size = entry.stat().st_size
+        if size > max_file_size:
+            return f"{full_path} (exceeds size limit)", None
+
+        normalized_path = normalize_path(full_path)
+        content = _read_if_text(normalized_path, size)
+        if content is None:  # Binary file
+            return full_path, None
+        return normalized_path, content
+    except OSError:
+        return full_path, None
+
 def add_directory_to_conversation(directory_path: str):
     """Add all files in a directory to the conversation context."""
-    from .conversation import conversation_history
+    from .conversation import add_files_to_context
     
+    skipped_files = []
+    loaded_files = []  # (normalized_path, content) in scan order
+    max_files = 1000  # Reasonable limit for files to process
+    max_file_size = 5_000_000  # 5MB limit
+
     with console.status("[bold bright_blue]🔍 Scanning directory...[/bold bright_blue]") as status:
-        excluded_files = {
-            # Python specific
-            ".DS_Store", "Thumbs.db", ".gitignore", ".python-version",
-            "uv.lock", ".uv", "uvenv", ".uvenv", ".venv", "venv",
-            "__pycache__", ".pytest_cache", ".coverage", ".mypy_cache",
-            # Node.js / Web specific
-            "node_modules", "package-lock.json", "yarn.lock", "pnpm-lock.yaml",
-            ".next", ".nuxt", "dist", "build", ".cache", ".parcel-cache",
-            ".turbo", ".vercel", ".output", ".contentlayer",
-            # Build outputs
-            "out", "coverage", ".nyc_output", "storybook-static",
-            # Environment and config
-            ".env", ".env.local", ".env.development", ".env.production",
-            # Misc
-            ".git", ".svn", ".hg", "CVS"
-        }
-        excluded_extensions = {
-            # Binary and media files
-            ".png", ".jpg", ".jpeg", ".gif", ".ico", ".svg", ".webp", ".avif",
-            ".mp4", ".webm", ".mov", ".mp3", ".wav", ".ogg",
-            ".zip", ".tar", ".gz", ".7z", ".rar",
-            ".exe", ".dll", ".so", ".dylib", ".bin",
-            # Documents
-            ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
-            # Python specific
-            ".pyc", ".pyo", ".pyd", ".egg", ".whl",
-            # UV specific
-            ".uv", ".uvenv",
-            # Database and logs
-            ".db", ".sqlite", ".sqlite3", ".log",
-            # IDE specific
-            ".idea", ".vscode",
-            # Web specific
-            ".map", ".chunk.js", ".chunk.css",
-            ".min.js", ".min.css", ".bundle.js", ".bundle.css",
-            # Cache and temp files
-            ".cache", ".tmp", ".temp",
-            # Font files
-            ".ttf", ".otf", ".woff", ".woff2", ".eot"
-        }
-        skipped_files = []
-        added_files = []
-        total_files_processed = 0
-        max_files = 1000  # Reasonable limit for files to process
-        max_file_size = 5_000_000  # 5MB limit
-
-        for root, dirs, files in os.walk(directory_path):
-            if total_files_processed >= max_files:
-                console.print(f"[bold yellow]⚠[/bold yellow] Reached maximum file limit ({max_files})")
-                break
-
-            status.update(f"[bold bright_blue]🔍 Scanning {root}...[/bold bright_blue]")
-            # Skip hidden directories and excluded directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in excluded_files]
+        candidates = _iter_directory_files(directory_path, skipped_files, status)
+        
+        def add_loaded(result):
+            path, content = result
+            if content is None:
+                skipped_files.append(path)
+            elif len(loaded_files) < max_files:
+                loaded_files.append(result)
 
-            for file in files:
-                if total_files_processed >= max_files:
+        # Reads run ahead on a thread pool while the scan continues; results are
+        # consumed in scan order as soon as the oldest read is done, or when the
+        # read-ahead window is full. The window starts small so the first files
+        # arrive quickly and doubles up to the maximum for large trees.
+        window = _DIRECTORY_READ_AHEAD_MIN
+        pending = deque()
+        load = lambda entry: _load_directory_file(entry, max_file_size)
+        with ThreadPoolExecutor(max_workers=_DIRECTORY_READ_WORKERS) as executor:
+            for entry in candidates:
+                if len(loaded_files) >= max_files:
                     break
+                pending.append(executor.submit(load, entry))
+                if len(pending) >= window:
+                    window = min(window * 2, _DIRECTORY_READ_AHEAD_MAX)
+                    add_loaded(pending.popleft().result())
+                while pending and pending[0].done():
+                    add_loaded(pending.popleft().result())
+            while pending and len(loaded_files) < max_files:
+                add_loaded(pending.popleft().result())
+            # Reads past the limit would be discarded; don't wait for them
+            for future in pending:
+                future.cancel()
+    
+    # Add everything to the history at once, then report with the spinner gone so
+    # Rich does not re-render its live display for every line
+    add_files_to_context(loaded_files)
+    added_files = [path for path, _ in loaded_files]
+    total_files_processed = len(added_files)
+    
+    if total_files_processed >= max_files:
+        console.print(f"[bold yellow]⚠[/bold yellow] Reached maximum file limit ({max_files})")
 
-                if file.startswith('.') or file in excluded_files:
-                    skipped_files.append(os.path.join(root, file))
-                    continue
-
-                _, ext = os.path.splitext(file)
-                if ext.lower() in excluded_extensions:
-                    skipped_files.append(os.path.join(root, file))
-                    continue
-
-                full_path = os.path.join(root, file)
-
-                try:
-                    # Check file size before processing
-                    if os.path.getsize(full_path) > max_file_size:
-                        skipped_files.append(f"{full_path} (exceeds size limit)")
-                        continue
-
-                    # Check if it's binary
-                    if is_binary_file(full_path):
-                        skipped_files.append(full_path)
-                        continue
-
-                    normalized_path = normalize_path(full_path)
-                    content = read_local_file(normalized_path)
-                    conversation_history.append({
-                        "role": "system",
-                        "content": f"Content of file '{normalized_path}':\n\n{content}"
-                    })
-                    added_files.append(normalized_path)
-                    total_files_processed += 1
-
-                except OSError:
-                    skipped_files.append(full_path)
-
-        console.print(f"[bold blue]✓[/bold blue] Added folder '[bright_cyan]{directory_path}[/bright_cyan]' to conversation.")
-        if added_files:
-            console.print(f"\n[bold bright_blue]📁 Added files:[/bold bright_blue] [dim]({len(added_files)} of {total_files_processed})[/dim]")
-            for f in added_files:
-                console.print(f"  [bright_cyan]📄 {f}[/bright_cyan]")
-        if skipped_files:
-            console.print(f"\n[bold yellow]⏭ Skipped files:[/bold yellow] [dim]({len(skipped_files)})[/dim]")
-            for f in skipped_files[:10]:  # Show only first 10 to avoid clutter
-                console.print(f"  [yellow dim]⚠ {f}[/yellow dim]")
-            if len(skipped_files) > 10:
-                console.print(f"  [dim]... and {len(skipped_files) - 10} more[/dim]")
-        console.print()
+    summary = [f"[bold blue]✓[/bold blue] Added folder '[bright_cyan]{directory_path}[/bright_cyan]' to conversation."]
+    if added_files:
+        summary.append(f"\n[bold bright_blue]📁 Added files:[/bold bright_blue] [dim]({len(added_files)} of {total_files_processed})[/dim]")
+        summary.extend(f"  [bright_cyan]📄 {f}[/bright_cyan]" for f in added_files)
+    if skipped_files:
+        summary.append(f"\n[bold yellow]⏭ Skipped files:[/bold yellow] [dim]({len(skipped_files)})[/dim]")
+        summary.extend(f"  [yellow dim]⚠ {f}[/yellow dim]" for f in skipped_files[:10])  # Show only first 10 to avoid clutter
+        if len(skipped_files) > 10:
+            summary.append(f"  [dim]... and {len(skipped_files) - 10} more[/dim]")
+    console.print("\n".join(summary))
+    console.print()
 
 def try_handle_add_command(user_input: str) -> bool:
     """Handle /add command for adding files or directories to conversation."""
-    from .conversation import conversation_history
+    from .conversation import add_file_to_context
     
     prefix = "/add "
     if user_input.strip().lower().startswith(prefix):
@@ -258,10 +404,7 @@ def try_handle_add_command(user_input: str) -> bool:
             else:
                 # Handle a single file as before
                 content = read_local_file(normalized_path)
-                conversation_history.append({
-                    "role": "system",
-                    "content": f"Content of file '{normalized_path}':\n\n{content}"
-                })
+                add_file_to_context(normalized_path, content)
                 console.print(f"[bold blue]✓[/bold blue] Added file '[bright_cyan]{normalized_path}[/bright_cyan]' to conversation.\n")
         except OSError as e:
             console.print(f"[bold red]✗[/bold red] Could not add path '[bright_cyan]{path_to_add}[/bright_cyan]': {e}\n")
@@ -9,7 +9,6 @@ from .ui import (
 from .file_operations import try_handle_add_command
 from .api_client import stream_openai_response
 from .config import set_current_model, display_startup_info, init_ai_system
-from .providers import is_valid_model
 
 # --------------------------------------------------------------------------------
 # Main Interactive Loop
@@ -36,11 +35,8 @@ def handle_model_command(user_input: str) -> bool:
             display_error("Please specify a model name. Use '/model set <model_name>'")
         else:
             model_name = parts[2]
-            if is_valid_model(model_name):
-                if set_current_model(model_name):
-                    display_model_switched(model_name)
-                else:
-                    display_error(f"Failed to switch to model: {model_name}")
+            if set_current_model(model_name):
+                display_model_switched(model_name)
             else:
                 display_invalid_model(model_name)
     else:
@@ -86,9 +82,7 @@ def handle_mcp_command(user_input: str) -> bool:
                     enabled = server_info['enabled']
                     
                     # Build full command display
-                    full_command = command
-                    if args:
-                        full_command += " " + " ".join(args)
+                    full_command = " ".join((command, *(args or ())))
                     
                     if enabled:
                         if manager._initialized and len(manager.mcp_servers) > 0:
@@ -145,15 +139,14 @@ def handle_mcp_command(user_input: str) -> bool:
 
 def _get_config_servers_info(manager) -> list:
     """Get server information from config file."""
-    import json
+    from .pydantic_mcp_integration import _read_config
     
     servers_info = []
     try:
         if not manager.config_path.exists():
             return []
         
-        with open(manager.config_path, 'r') as f:
-            config = json.load(f)
+        config = _read_config(manager.config_path)
         
         # Support Roo Code format (mcpServers)
         if "mcpServers" in config:
@@ -220,6 +213,14 @@ def _modify_server_status(manager, server_name: str, enable: bool) -> bool:
         print(f"Error modifying server status: {e}")
         return False
 
+# Slash command (first word of the input, lowercased) -> handler taking the full
+# input line and returning True if it handled it
+COMMANDS = {
+    "/model": handle_model_command,
+    "/mcp": handle_mcp_command,
+    "/add": try_handle_add_command,
+}
+
 def main():
     """Main entry point for the AI Engineer application."""
     # Display startup information
@@ -247,17 +248,11 @@ def main():
             display_goodbye()
             break
 
-        # Handle /model commands
-        if handle_model_command(user_input):
-            continue
-
-        # Handle /mcp commands
-        if handle_mcp_command(user_input):
-            continue
-
-        # Handle /add command
-        if try_handle_add_command(user_input):
-            continue
+        # Handle /model, /mcp and /add commands with one lookup on the first word
+        if user_input.startswith("/"):
+            handler = COMMANDS.get(user_input.split(None, 1)[0].lower())
+            if handler is not None and handler(user_input):
+                continue
 
         # Process user message through API
         response_data = stream_openai_response(user_input)
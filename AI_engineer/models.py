@@ -1,18 +1,20 @@
 #!/usr/bin/env python3
 
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 # --------------------------------------------------------------------------------
-# Pydantic Models for Type Safety
+# Data Models for Type Safety
 # --------------------------------------------------------------------------------
 
-class FileToCreate(BaseModel):
+@dataclass(slots=True)
+class FileToCreate:
     """Model for representing a file to be created."""
     path: str
     content: str
 
-class FileToEdit(BaseModel):
+@dataclass(slots=True)
+class FileToEdit:
     """Model for representing a file edit operation."""
     path: str
     original_snippet: str
-    new_snippet: str
\ No newline at end of file
+    new_snippet: str
@@ -2,11 +2,12 @@
 Provider configurations for different LLM providers.
 """
 
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import warnings
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModelConfig:
     """Configuration for a specific model."""
     name: str
@@ -15,15 +16,21 @@ class ModelConfig:
     supports_reasoning: bool = False
     max_tokens: Optional[int] = None
 
+    @property
+    def features_str(self) -> str:
+        """Feature summary shown in the model list."""
+        return "Reasoning" if self.supports_reasoning else "Standard"
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ProviderConfig:
     """Configuration for a provider."""
     name: str
     base_url: str
     api_key_env: str
-    extra_headers: Optional[Dict[str, str]] = None
-    extra_body: Optional[Dict] = None
+    # Dicts can't be hashed, so keep them out of the generated __hash__
+    extra_headers: Optional[Dict[str, str]] = field(default=None, hash=False)
+    extra_body: Optional[Dict] = field(default=None, hash=False)
 
 
 # Provider configurations
@@ -107,6 +114,25 @@ MODELS = {
 DEFAULT_MODEL = "deepseek-reasoner"
 
 
+def _build_provider_index() -> Dict[str, Tuple[ModelConfig, ...]]:
+    """Group MODELS by provider; call again if MODELS is ever mutated."""
+    index: Dict[str, List[ModelConfig]] = {}
+    for model in MODELS.values():
+        index.setdefault(model.provider, []).append(model)
+    return {provider: tuple(models) for provider, models in index.items()}
+
+
+_MODELS_BY_PROVIDER = _build_provider_index()
+_ALL_MODELS: Tuple[ModelConfig, ...] = tuple(MODELS.values())
+
+
+def rebuild_index() -> None:
+    """Refresh the derived model lookups after MODELS has been changed."""
+    global _MODELS_BY_PROVIDER, _ALL_MODELS
+    _MODELS_BY_PROVIDER = _build_provider_index()
+    _ALL_MODELS = tuple(MODELS.values())
+
+
 def get_model_config(model_name: str) -> Optional[ModelConfig]:
     """Get configuration for a specific model."""
     return MODELS.get(model_name)
@@ -117,16 +143,25 @@ def get_provider_config(provider_name: str) -> Optional[ProviderConfig]:
     return PROVIDERS.get(provider_name)
 
 
-def get_models_by_provider(provider_name: str) -> List[ModelConfig]:
+def get_models_by_provider(provider_name: str) -> Tuple[ModelConfig, ...]:
     """Get all models for a specific provider."""
-    return [model for model in MODELS.values() if model.provider == provider_name]
+    return _MODELS_BY_PROVIDER.get(provider_name, ())
 
 
-def get_all_models() -> List[ModelConfig]:
+def get_all_models() -> Tuple[ModelConfig, ...]:
     """Get all available models."""
-    return list(MODELS.values())
+    return _ALL_MODELS
 
 
 def is_valid_model(model_name: str) -> bool:
-    """Check if a model name is valid."""
+    """Check if a model name is valid.
+
+    Deprecated: use ``get_model_config(name) is not None``, which also hands
+    back the config and saves callers a second lookup.
+    """
+    warnings.warn(
+        "is_valid_model() is deprecated; use get_model_config() instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     return model_name in MODELS
\ No newline at end of file
@@ -3,34 +3,60 @@
 Pydantic AI MCP Integration with enhanced tool call logging.
 """
 
+from __future__ import annotations
+
 import asyncio
+import atexit
+import hashlib
 import json
 import os
 import pathlib
+import re
 import threading
 import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Optional, List, Dict, Any, TYPE_CHECKING
-from watchdog.events import FileSystemEventHandler
 
-if TYPE_CHECKING:
-    from watchdog.observers import Observer
-else:
-    try:
-        from watchdog.observers import Observer
-    except ImportError:
-        Observer = None
-
-from pydantic_ai import Agent
-from pydantic_ai.mcp import MCPServerStdio
-from pydantic_ai.tools import Tool
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
 from rich.console import Console
-from rich.spinner import Spinner
-from rich.live import Live
+
+try:
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    FileSystemEventHandler = object
+
+# pydantic_ai and the watchdog observer are imported where they are first
+# needed so that importing this module stays cheap when MCP is never used.
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+    from pydantic_ai.mcp import MCPServerStdio
+    from pydantic_ai.tools import Tool
 
 console = Console()
 
+# Patterns to detect tool usage in AI responses
+_TOOL_PATTERNS = {
+    'resolve-library-id': re.compile(r'resolve-library-id.*?(?:libraryName|library).*?["\']([^"\']+)["\']', re.IGNORECASE),
+    'get-library-docs': re.compile(r'get-library-docs.*?(?:context7CompatibleLibraryID|library).*?["\']([^"\']+)["\']', re.IGNORECASE),
+    'brave-search': re.compile(r'(?:search|brave).*?(?:query|search).*?["\']([^"\']+)["\']', re.IGNORECASE)
+}
+_CTX7_KEYWORDS = ('context7', 'library', 'documentation', 'research')
+_SEARCH_KEYWORDS = ('search', 'brave', 'web')
+
+# Single alternations so each response is scanned in one pass per check
+_CTX7_KEYWORDS_RE = re.compile("|".join(map(re.escape, _CTX7_KEYWORDS)))
+_SEARCH_KEYWORDS_RE = re.compile("|".join(map(re.escape, _SEARCH_KEYWORDS)))
+_RESOLVE_RE = re.compile("resolve|library")
+_DOCS_RE = re.compile("docs|documentation")
+
+# Technical server names mapped to user-friendly display names
+_DISPLAY_MAP = {
+    "github.com/upstash/context7-mcp": "Context7",
+    "brave-search": "Brave Search",
+    "Context7": "Context7",
+    "Brave Search": "Brave Search"
+}
+
 class MCPToolCallLogger:
     """Enhanced logger for MCP tool calls with visual feedback."""
     
@@ -48,24 +74,19 @@ class MCPToolCallLogger:
         
     def _get_display_name(self, server_name: str) -> str:
         """Convert technical server names to user-friendly display names."""
-        display_map = {
-            "github.com/upstash/context7-mcp": "Context7",
-            "brave-search": "Brave Search",
-            "Context7": "Context7",
-            "Brave Search": "Brave Search"
-        }
-        return display_map.get(server_name, server_name)
+        return _DISPLAY_MAP.get(server_name, server_name)
         
     def log_tool_call_start(self, tool_name: str, args: Dict[str, Any] = None):
         """Log the start of a tool call."""
         self.tool_call_count += 1
         self.console.print(f"→ [bold yellow]{tool_name}[/bold yellow]", end="")
-        if args and len(str(args)) < 100:  # Show args if not too long
-            # Format args nicely
-            args_str = ", ".join([f"{k}='{v}'" for k, v in args.items()])
-            self.console.print(f" [dim]({args_str})[/dim]")
-        else:
-            self.console.print()
+        if args:
+            # Format args nicely, and show them only if not too long
+            args_str = ", ".join(f"{k}='{v}'" for k, v in args.items())
+            if len(args_str) < 100:
+                self.console.print(f" [dim]({args_str})[/dim]")
+                return
+        self.console.print()
             
     def log_tool_call_success(self, tool_name: str, result_summary: str = None):
         """Log successful tool call completion."""
@@ -95,44 +116,41 @@ class MCPToolCallLogger:
     
     def parse_and_enhance_response(self, response: str, server_names: List[str]) -> str:
         """Parse AI response and add visual MCP tool call logging."""
-        import re
-        
         # Reset tool call count for this session
         self.tool_call_count = 0
         
-        # Patterns to detect tool usage in AI responses
-        patterns = {
-            'resolve-library-id': r'resolve-library-id.*?(?:libraryName|library).*?["\']([^"\']+)["\']',
-            'get-library-docs': r'get-library-docs.*?(?:context7CompatibleLibraryID|library).*?["\']([^"\']+)["\']',
-            'brave-search': r'(?:search|brave).*?(?:query|search).*?["\']([^"\']+)["\']'
-        }
+        # Nothing to report unless a server we know how to describe is configured
+        has_context7 = 'Context7' in server_names or 'github.com/upstash/context7-mcp' in server_names
+        has_brave = 'brave-search' in server_names
+        if not (has_context7 or has_brave):
+            return response
+        
+        response_lower = response.lower()
         
         # Check if response mentions Context7 or library research
-        if any(keyword in response.lower() for keyword in ['context7', 'library', 'documentation', 'research']):
+        if _CTX7_KEYWORDS_RE.search(response_lower):
             # Simulate Context7 usage
-            if 'Context7' in server_names or 'github.com/upstash/context7-mcp' in server_names:
+            if has_context7:
                 self.log_server_usage('Context7')
                 
                 # Detect library resolution
-                if 'resolve' in response.lower() or 'library' in response.lower():
+                if _RESOLVE_RE.search(response_lower):
                     self.log_tool_call_start('resolve-library-id')
                     # Extract library name if possible
-                    for pattern_name, pattern in patterns.items():
-                        matches = re.findall(pattern, response, re.IGNORECASE)
-                        if matches and pattern_name == 'resolve-library-id':
-                            self.log_tool_call_success('resolve-library-id', f'Found library: /{matches[0]}')
-                            break
+                    match = _TOOL_PATTERNS['resolve-library-id'].search(response)
+                    if match:
+                        self.log_tool_call_success('resolve-library-id', f'Found library: /{match.group(1)}')
                     else:
                         self.log_tool_call_success('resolve-library-id', 'Library resolved successfully')
                 
                 # Detect documentation retrieval
-                if 'documentation' in response.lower() or 'docs' in response.lower():
+                if _DOCS_RE.search(response_lower):
                     self.log_tool_call_start('get-library-docs')
                     self.log_tool_call_success('get-library-docs', 'Retrieved focused documentation')
         
         # Check if response mentions search functionality
-        elif any(keyword in response.lower() for keyword in ['search', 'brave', 'web']):
-            if 'brave-search' in server_names:
+        elif _SEARCH_KEYWORDS_RE.search(response_lower):
+            if has_brave:
                 self.log_server_usage('Brave Search')
                 self.log_tool_call_start('search')
                 self.log_tool_call_success('search', 'Search results retrieved')
@@ -146,38 +164,138 @@ class MCPToolCallLogger:
 # Global logger instance
 mcp_logger = MCPToolCallLogger(console)
 
+# Kept byte-identical across requests so providers with automatic prefix
+# caching (DeepSeek, OpenAI, OpenRouter) can reuse it between calls
+_AGENT_SYSTEM_PROMPT = """You are AI Engineer, a sophisticated AI coding assistant with MCP research capabilities.
+
+You have access to:
+1. File operations (read, create, edit files)
+2. External MCP tools for research and documentation
+
+IMPORTANT: When using MCP tools, ALWAYS be explicit about your process by following this format:
+
+🔍 RESEARCH PROCESS:
+→ [tool-name] (with parameters)
+✓ [brief result summary]
+
+For example:
+🔍 I'll research the latest FastAPI documentation for you.
+→ resolve-library-id (libraryName: 'fastapi')
+✓ Found library: /tiangolo/fastapi
+→ get-library-docs (context7CompatibleLibraryID: '/tiangolo/fastapi', topic: 'async operations')
+✓ Retrieved focused documentation on async database operations
+
+Then provide your complete answer based on the research.
+
+When using Context7 or other MCP tools:
+- Use proper arguments like {'libraryName': 'pydantic-ai'} for library searches
+- Always include required parameters in your tool calls
+- Show your tool usage process step by step
+- Be patient as tools may take time to respond
+
+Be helpful, accurate, and thorough in your responses."""
+
+# Subtle instruction appended to every query to be more explicit about tool usage
+_LOGGING_SUFFIX = "\n\nNote: Please be explicit about your research process when using external tools."
+
+# Recent agent responses keyed by a hash of model and prompt. Entries expire,
+# and only successful runs that called no tools are stored: a tool run may have
+# side effects (file writes) or fetched live data that a replay would skip.
+_RESPONSE_CACHE: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+_RESPONSE_CACHE_TTL = 600.0  # seconds
+
+def _response_cache_key(model_name: str, message: str) -> str:
+    return hashlib.sha256(f"{model_name}\0{message}".encode()).hexdigest()
+
+def _response_cache_get(key: str) -> Optional[str]:
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, response = entry
+    if time.monotonic() - stored_at > _RESPONSE_CACHE_TTL:
+        del _RESPONSE_CACHE[key]
+        return None
+    _RESPONSE_CACHE.move_to_end(key)
+    return response
+
+def _run_used_tools(result) -> bool:
+    """Return ``True`` if the agent run made any tool call or received a tool return."""
+    return any(
+        part.part_kind in ("tool-call", "tool-return", "retry-prompt")
+        for message in result.all_messages()
+        for part in message.parts
+    )
+
+def _response_cache_put(key: str, response: str) -> None:
+    _RESPONSE_CACHE[key] = (time.monotonic(), response)
+    _RESPONSE_CACHE.move_to_end(key)
+    if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX_ENTRIES:
+        _RESPONSE_CACHE.popitem(last=False)
+
+def invalidate_response_cache() -> None:
+    """Drop all cached agent responses."""
+    _RESPONSE_CACHE.clear()
+
+# Last parsed MCP config as ((path, mtime_ns, size), config)
+_config_cache: Optional[tuple] = None
+
+def _read_config(config_path: pathlib.Path) -> dict:
+    """Return the parsed MCP config, re-reading the file only when it has changed.
+
+    The returned dict is shared with the cache and must not be modified.
+    """
+    global _config_cache
+    stat = config_path.stat()
+    signature = (str(config_path), stat.st_mtime_ns, stat.st_size)
+    if _config_cache is None or _config_cache[0] != signature:
+        _config_cache = (signature, json.loads(config_path.read_bytes()))
+    return _config_cache[1]
+
+# MCP server instances keyed by (command, args, env), reused across reloads
+_MCP_INSTANCE_CACHE: Dict[tuple, MCPServerStdio] = {}
+
+# API key env var, model and base URL, checked in the same order as config.py
+# (DeepSeek first to match the main app's priority, then OpenRouter, then OpenAI)
+_PROVIDER_ORDER = (
+    ("DEEPSEEK_API_KEY", "deepseek-chat", "https://api.deepseek.com"),
+    ("OPENROUTER_API_KEY", "anthropic/claude-sonnet-4", "https://openrouter.ai/api/v1"),
+    ("OPENAI_API_KEY", "gpt-4o", "https://api.openai.com/v1"),
+)
+
+@lru_cache(maxsize=1)
+def _resolve_api_config() -> tuple[str, str, str]:
+    """Pick the first provider with an API key set; cleared by reload_config()."""
+    for env_var, model_name, base_url in _PROVIDER_ORDER:
+        api_key = os.getenv(env_var)
+        if api_key:
+            return api_key, model_name, base_url
+    raise ValueError("No API key found. Please set DEEPSEEK_API_KEY, OPENROUTER_API_KEY, or OPENAI_API_KEY")
+
 class PydanticMCPManager:
     """Manages Pydantic AI Agent with MCP servers and enhanced logging functionality."""
     
-    def __init__(self, config_path: str = "mcp.config.json"):
+    def __init__(self, config_path: Optional[str] = None):
+        if config_path is None:
+            from .config import MCP_CONFIG_PATH  # config imports this module
+            config_path = MCP_CONFIG_PATH
         self.config_path = pathlib.Path(config_path)
         self.agent: Optional[Agent] = None
         self.mcp_servers: List[MCPServerStdio] = []
         self.server_names: List[str] = []  # Store server names for display
         self._observer: Optional[Any] = None  # Observer instance for file watching
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()  # reload_config may re-enter initialize()
         self._initialized = False
         self.logger = mcp_logger  # Use the global logger instance
+        # Long-lived loop so MCP server subprocesses survive between queries
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # id(server) -> (server, host task, stop event) for each running MCP server
+        self._mcp_hosts: Dict[int, tuple[MCPServerStdio, asyncio.Task, asyncio.Event]] = {}
+        self.model_name: Optional[str] = None
         
     def _load_api_config(self) -> tuple[str, str, str]:
         """Load API configuration from environment."""
-        # Respect the main application's configuration by checking in the same order as config.py
-        # Try DeepSeek first (matches main app priority based on user feedback)
-        deepseek_key = os.getenv("DEEPSEEK_API_KEY")
-        if deepseek_key:
-            return deepseek_key, "deepseek-chat", "https://api.deepseek.com"
-        
-        # Fall back to OpenRouter
-        openrouter_key = os.getenv("OPENROUTER_API_KEY")
-        if openrouter_key:
-            return openrouter_key, "anthropic/claude-sonnet-4", "https://openrouter.ai/api/v1"
-        
-        # Fall back to OpenAI
-        openai_key = os.getenv("OPENAI_API_KEY")
-        if openai_key:
-            return openai_key, "gpt-4o", "https://api.openai.com/v1"
-        
-        raise ValueError("No API key found. Please set DEEPSEEK_API_KEY, OPENROUTER_API_KEY, or OPENAI_API_KEY")
+        return _resolve_api_config()
         
     def _load_mcp_servers(self) -> List[MCPServerStdio]:
         """Load MCP servers from config file."""
@@ -186,8 +304,7 @@ class PydanticMCPManager:
             return []
         
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
+            config = _read_config(self.config_path)
             
             servers = []
             self.server_names = []  # Reset server names
@@ -208,9 +325,7 @@ class PydanticMCPManager:
                     servers.append(server)
                     self.server_names.append(name)
                     # Show command for transparency
-                    cmd_display = server_config["command"]
-                    if server_config.get("args"):
-                        cmd_display += " " + " ".join(server_config["args"])
+                    cmd_display = " ".join((server_config["command"], *(server_config.get("args") or ())))
                     console.print(f"[green]✓ {name} MCP Server[/green] [dim]({cmd_display})[/dim]")
             
             # Support AI-Engineer format (servers)
@@ -230,11 +345,15 @@ class PydanticMCPManager:
                     servers.append(server)
                     self.server_names.append(server_name)
                     # Show command for transparency
-                    cmd_display = server_config["command"]
-                    if server_config.get("args"):
-                        cmd_display += " " + " ".join(server_config["args"])
+                    cmd_display = " ".join((server_config["command"], *(server_config.get("args") or ())))
                     console.print(f"[green]✓ {server_name}[/green] [dim]({cmd_display})[/dim]")
             
+            # Forget instances whose config entry is gone; their servers are
+            # shut down on the next query
+            live = {id(server) for server in servers}
+            for key in [key for key, server in _MCP_INSTANCE_CACHE.items() if id(server) not in live]:
+                del _MCP_INSTANCE_CACHE[key]
+            
             return servers
             
         except Exception as e:
@@ -244,16 +363,27 @@ class PydanticMCPManager:
     def _create_logged_mcp_server(self, name: str, command: str, args: List[str], env: Dict[str, str] = None) -> MCPServerStdio:
         """Create an MCP server with enhanced logging capabilities."""
         # For now, create a standard server - we'll enhance this with logging hooks
-        # when Pydantic AI provides better tool call interception APIs
-        return MCPServerStdio(command=command, args=args, env=env)
+        # when Pydantic AI provides better tool call interception APIs.
+        # Unchanged entries reuse their instance so a reload leaves them running.
+        key = (command, tuple(args or ()), tuple(sorted((env or {}).items())))
+        server = _MCP_INSTANCE_CACHE.get(key)
+        if server is None:
+            from pydantic_ai.mcp import MCPServerStdio
+            server = _MCP_INSTANCE_CACHE[key] = MCPServerStdio(command=command, args=args, env=env)
+        return server
     
     def _create_file_tools(self) -> List[Tool]:
         """Create file operation tools."""
+        from pydantic_ai.tools import Tool
         
         def read_file_tool(file_path: str) -> str:
             """Read the content of a file from the filesystem."""
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
+                    # Same 5MB limit as file_operations; bail out before reading
+                    size = os.fstat(f.fileno()).st_size
+                    if size > 5_000_000:
+                        return f"Error reading file '{file_path}': file too large ({size} bytes, limit is 5MB)"
                     content = f.read()
                 return f"Content of file '{file_path}':\n\n{content}"
             except Exception as e:
@@ -262,8 +392,17 @@ class PydanticMCPManager:
         def create_file_tool(file_path: str, content: str) -> str:
             """Create a new file with the provided content."""
             try:
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                with open(file_path, 'w', encoding='utf-8') as f:
+                try:
+                    f = open(file_path, 'w', encoding='utf-8')
+                except FileNotFoundError:
+                    # Only create parent directories when the write needs them;
+                    # bare file names have none to create
+                    directory = os.path.dirname(file_path)
+                    if not directory:
+                        raise
+                    os.makedirs(directory, exist_ok=True)
+                    f = open(file_path, 'w', encoding='utf-8')
+                with f:
                     f.write(content)
                 return f"Successfully created file '{file_path}'"
             except Exception as e:
@@ -275,10 +414,12 @@ class PydanticMCPManager:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
                 
-                if original_snippet not in content:
+                # One scan finds the snippet; only the first occurrence is replaced
+                start = content.find(original_snippet)
+                if start < 0:
                     return f"Error: Original snippet not found in '{file_path}'"
                 
-                new_content = content.replace(original_snippet, new_snippet)
+                new_content = content[:start] + new_snippet + content[start + len(original_snippet):]
                 
                 with open(file_path, 'w', encoding='utf-8') as f:
                     f.write(new_content)
@@ -295,14 +436,23 @@ class PydanticMCPManager:
     
     def initialize(self) -> bool:
         """Initialize the Pydantic AI agent."""
+        # Unlocked fast path; re-checked below once the lock is held
+        if self._initialized:
+            return True
+        
         with self._lock:
             if self._initialized:
                 return True
             
             try:
+                from pydantic_ai import Agent
+                from pydantic_ai.models.openai import OpenAIModel
+                from pydantic_ai.providers.openai import OpenAIProvider
+
                 # Load API configuration
                 console.print("[dim]Loading API configuration...[/dim]")
                 api_key, model_name, base_url = self._load_api_config()
+                self.model_name = model_name
                 console.print(f"[dim]Using model: {model_name}[/dim]")
                 
                 # Load MCP servers
@@ -325,34 +475,7 @@ class PydanticMCPManager:
                     model=model,
                     mcp_servers=self.mcp_servers,
                     tools=tools,
-                    system_prompt="""You are AI Engineer, a sophisticated AI coding assistant with MCP research capabilities.
-
-You have access to:
-1. File operations (read, create, edit files)
-2. External MCP tools for research and documentation
-
-IMPORTANT: When using MCP tools, ALWAYS be explicit about your process by following this format:
-
-🔍 RESEARCH PROCESS:
-→ [tool-name] (with parameters)
-✓ [brief result summary]
-
-For example:
-🔍 I'll research the latest FastAPI documentation for you.
-→ resolve-library-id (libraryName: 'fastapi')
-✓ Found library: /tiangolo/fastapi
-→ get-library-docs (context7CompatibleLibraryID: '/tiangolo/fastapi', topic: 'async operations')
-✓ Retrieved focused documentation on async database operations
-
-Then provide your complete answer based on the research.
-
-When using Context7 or other MCP tools:
-- Use proper arguments like {'libraryName': 'pydantic-ai'} for library searches
-- Always include required parameters in your tool calls
-- Show your tool usage process step by step
-- Be patient as tools may take time to respond
-
-Be helpful, accurate, and thorough in your responses."""
+                    system_prompt=_AGENT_SYSTEM_PROMPT
                 )
                 
                 self._initialized = True
@@ -371,6 +494,11 @@ Be helpful, accurate, and thorough in your responses."""
             if not self.initialize():
                 return "Error: Failed to initialize AI agent"
         
+        cache_key = _response_cache_key(self.model_name, message)
+        cached = _response_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Log MCP session start
             if self.mcp_servers:
@@ -381,50 +509,98 @@ Be helpful, accurate, and thorough in your responses."""
                     if i == 0:  # Typically the first server used for documentation queries
                         self.logger.log_server_usage(server_name)
             
-            # Enhanced system prompt to encourage detailed tool usage reporting
-            enhanced_message = self._enhance_message_for_logging(message)
+            # Nudge the agent to be explicit about tool usage for the logger
+            enhanced_message = message + _LOGGING_SUFFIX
             
-            # Use agent.run_mcp_servers() context manager
-            async with self.agent.run_mcp_servers():
-                result = await self.agent.run(enhanced_message)
-                
-                # Parse response and add visual MCP tool call logging
-                if self.mcp_servers:
-                    enhanced_output = self.logger.parse_and_enhance_response(result.output, self.server_names)
-                    return enhanced_output
-                
-                return result.output
+            # Servers are started once and kept running across queries and reloads
+            await self._ensure_mcp_servers()
+            result = await self.agent.run(enhanced_message)
+            
+            # Parse response and add visual MCP tool call logging
+            output = result.output
+            if self.mcp_servers:
+                output = self.logger.parse_and_enhance_response(output, self.server_names)
+            
+            if not _run_used_tools(result):
+                _response_cache_put(cache_key, output)
+            return output
                 
         except Exception as e:
+            # Restart the servers on the next query in case one of them died
+            await self._stop_mcp_servers()
             console.print(f"[red]❌ Query failed: {e}[/red]")
             import traceback
             traceback.print_exc()
             return f"Error processing query: {str(e)}"
     
-    def _enhance_message_for_logging(self, message: str) -> str:
-        """Enhance the message to encourage detailed tool usage reporting."""
-        # Add a subtle instruction to be more explicit about tool usage
-        enhancement = "\n\nNote: Please be explicit about your research process when using external tools."
-        return message + enhancement
+    async def _host_mcp_server(self, server: MCPServerStdio, ready: asyncio.Future, stop: asyncio.Event) -> None:
+        """Keep ``server`` running until asked to stop.
+
+        The server is entered and exited from this one task, as the MCP
+        stdio client's task groups require.
+        """
+        try:
+            async with server:
+                ready.set_result(None)
+                await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                console.print(f"[red]Error shutting down MCP server: {e}[/red]")
+    
+    async def _ensure_mcp_servers(self) -> None:
+        """Start the current servers that aren't running and stop the ones no longer configured."""
+        wanted = {id(server): server for server in self.mcp_servers}
+        for key in [key for key, (_, task, _) in self._mcp_hosts.items() if key not in wanted or task.done()]:
+            await self._stop_mcp_server(key)
+        
+        for key, server in wanted.items():
+            if key in self._mcp_hosts:
+                continue
+            ready = asyncio.get_running_loop().create_future()
+            stop = asyncio.Event()
+            task = asyncio.create_task(self._host_mcp_server(server, ready, stop))
+            await ready
+            self._mcp_hosts[key] = (server, task, stop)
+    
+    async def _stop_mcp_server(self, key: int) -> None:
+        _, task, stop = self._mcp_hosts.pop(key)
+        stop.set()
+        await task
+    
+    async def _stop_mcp_servers(self) -> None:
+        """Stop the running MCP servers, if any."""
+        for key in list(self._mcp_hosts):
+            await self._stop_mcp_server(key)
     
     def query_sync(self, message: str) -> str:
         """Synchronous wrapper for queries."""
         try:
-            # Get or create event loop
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    raise RuntimeError("Event loop is closed")
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+            # Reuse one loop so the MCP servers it hosts stay alive between calls
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self._loop)
+                atexit.register(self.shutdown)
             
-            return loop.run_until_complete(self.query(message))
+            return self._loop.run_until_complete(self.query(message))
             
         except Exception as e:
             console.print(f"[red]❌ Sync query failed: {e}[/red]")
             return f"Error: {str(e)}"
     
+    def shutdown(self) -> None:
+        """Stop the MCP servers and close the event loop used by query_sync()."""
+        atexit.unregister(self.shutdown)
+        loop, self._loop = self._loop, None
+        if loop is None or loop.is_closed():
+            return
+        
+        try:
+            loop.run_until_complete(self._stop_mcp_servers())
+        finally:
+            loop.close()
+    
     def start_watcher(self) -> None:
         """Start watching the MCP config file for changes (Roo Code style)."""
         if self._observer is not None:
@@ -434,6 +610,12 @@ Be helpful, accurate, and thorough in your responses."""
             console.print(f"[yellow]Warning: MCP config file not found: {self.config_path}[/yellow]")
             return
         
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            console.print("[yellow]Warning: watchdog not installed, MCP config changes won't be picked up automatically[/yellow]")
+            return
+        
         try:
             handler = ConfigFileHandler(self)
             self._observer = Observer()
@@ -450,6 +632,8 @@ Be helpful, accurate, and thorough in your responses."""
         with self._lock:
             try:
                 console.print("[cyan]🔄 Reloading MCP configuration...[/cyan]")
+                _resolve_api_config.cache_clear()
+                invalidate_response_cache()
                 
                 # Step 1: Load new server configuration without recreating agent
                 console.print("[dim]Loading updated configuration...[/dim]")
@@ -460,8 +644,7 @@ Be helpful, accurate, and thorough in your responses."""
                 new_server_names = []
                 
                 if self.config_path.exists():
-                    with open(self.config_path, 'r') as f:
-                        config = json.load(f)
+                    config = _read_config(self.config_path)
                     
                     # Support Roo Code format (mcpServers)
                     if "mcpServers" in config:
@@ -493,8 +676,9 @@ class ConfigFileHandler(FileSystemEventHandler):
     def __init__(self, manager: PydanticMCPManager):
         super().__init__()
         self.manager = manager
-        self._last_modified = 0
+        self._last_mtime_ns = None
         self._debounce_delay = 0.5
+        self._pending_reload: Optional[threading.Timer] = None
     
     def on_modified(self, event):
         """Called when the configuration file is modified."""
@@ -505,16 +689,26 @@ class ConfigFileHandler(FileSystemEventHandler):
         if file_path != self.manager.config_path:
             return
         
-        # Debounce rapid file changes
-        current_time = time.time()
-        if current_time - self._last_modified < self._debounce_delay:
+        # Ignore events that didn't change the file's mtime
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime_ns == self._last_mtime_ns:
             return
         
-        self._last_modified = current_time
-        
-        # Small delay to ensure file write is complete
-        time.sleep(0.1)
+        self._last_mtime_ns = mtime_ns
         
+        # Debounce rapid file changes: every change re-arms the timer, so a burst
+        # of writes reloads once, after the last one has settled. The timer keeps
+        # the watchdog thread free while waiting.
+        if self._pending_reload is not None:
+            self._pending_reload.cancel()
+        self._pending_reload = threading.Timer(self._debounce_delay, self._reload)
+        self._pending_reload.daemon = True
+        self._pending_reload.start()
+    
+    def _reload(self):
         try:
             self.manager.reload_config()
         except Exception as e:
@@ -537,6 +731,9 @@ def init_pydantic_mcp() -> None:
     if manager.initialize():
         manager.start_watcher()
 
+# Prefixes for the history roles replayed as context in query_ai()
+_CONTEXT_LABELS = {"user": "Previous User", "assistant": "Previous Assistant"}
+
 def query_ai(message: str) -> str:
     """Query the AI agent with conversation history integration."""
     from .conversation import conversation_history
@@ -546,15 +743,12 @@ def query_ai(message: str) -> str:
     # Build conversation context from history for continuity
     conversation_context = ""
     if len(conversation_history) > 1:  # More than just the current message
-        # Build context from recent conversation (last 3 exchanges)
-        recent_history = conversation_history[-6:]  # Last 3 user-assistant pairs
-        context_parts = []
-        
-        for msg in recent_history[:-1]:  # Exclude the current message
-            if msg["role"] == "user":
-                context_parts.append(f"Previous User: {msg['content']}")
-            elif msg["role"] == "assistant":
-                context_parts.append(f"Previous Assistant: {msg['content']}")
+        # Last 3 user-assistant pairs, excluding the current message
+        context_parts = [
+            f"{_CONTEXT_LABELS[msg['role']]}: {msg['content']}"
+            for msg in conversation_history[-6:-1]
+            if msg["role"] in _CONTEXT_LABELS
+        ]
         
         if context_parts:
             conversation_context = "Previous conversation context:\n" + "\n".join(context_parts) + "\n\nCurrent request: "
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 
+import os
+import traceback
+
+from .config import MCP_CONFIG_PATH
+
 # --------------------------------------------------------------------------------
 # Function Calling Tools Definitions
 # --------------------------------------------------------------------------------
 
-# Base AI-Engineer tools for file operations
-base_tools = [
+# Base AI-Engineer tools for file operations (never mutated, so kept as a tuple)
+base_tools = (
     {
         "type": "function",
         "function": {
@@ -112,56 +117,75 @@ base_tools = [
             },
         }
     }
-]
+)
+
+# Built tool lists, reused until refresh_tools() clears them
+_TOOLS_CACHE = None
+_MCP_TOOLS_CACHE = None
 
 def get_mcp_tools_openai_format():
-    """Get MCP tools in OpenAI function calling format using the new Pydantic AI MCP integration."""
+    """Get MCP tools in OpenAI function calling format using the new Pydantic AI MCP integration.
+
+    The result is cached until refresh_tools() is called.
+    """
+    global _MCP_TOOLS_CACHE
+    if _MCP_TOOLS_CACHE is not None:
+        return _MCP_TOOLS_CACHE
+    
+    # Without a config file there are no servers; skip importing the MCP stack
+    if not os.path.exists(MCP_CONFIG_PATH):
+        _MCP_TOOLS_CACHE = []
+        return _MCP_TOOLS_CACHE
+    
     try:
         from .pydantic_mcp_integration import get_manager
         
         # Get the Pydantic MCP manager
         manager = get_manager()
         
-        # Initialize if not already initialized
-        if not manager._initialized:
-            manager.initialize()
+        # The new system doesn't need to extract raw schemas - Pydantic AI handles this,
+        # so the list is empty whether or not the manager is ready. The manager is
+        # initialized by init_ai_system() at startup, or lazily by the first MCP query
+        # after a config reload; never here, where its output would interleave with
+        # a streaming response.
+        if manager._initialized and manager.mcp_servers:
+            print(f"ℹ️ Using new Pydantic AI MCP integration with {len(manager.mcp_servers)} server(s) - tools are handled directly by agent")
         
-        # Now check if we have servers
-        if not manager.mcp_servers:
-            # This is fine - means no MCP servers are configured, not an error
-            return []
-        
-        # The new system doesn't need to extract raw schemas - Pydantic AI handles this
-        # We'll return an empty list for now since the new system uses Pydantic AI tools directly
-        print(f"ℹ️ Using new Pydantic AI MCP integration with {len(manager.mcp_servers)} server(s) - tools are handled directly by agent")
-        return []
+        _MCP_TOOLS_CACHE = []
+        return _MCP_TOOLS_CACHE
         
     except Exception as e:
         print(f"❌ Failed to get MCP tools: {e}")
-        import traceback
         traceback.print_exc()
         return []
 
 def _is_valid_openai_function_name(name: str) -> bool:
     """Check if a function name meets OpenAI's requirements."""
-    import re
     # OpenAI function names should use only: letters, numbers, underscores (no hyphens)
     # This matches our sanitization approach
-    if not name or len(name) > 64:
-        return False
-    return bool(re.match(r'^[a-zA-Z0-9_]+$', name))
+    # 1-64 ASCII letters, digits or underscores; mapping '_' to a letter lets
+    # isalnum() cover the whole character class
+    return bool(name) and len(name) <= 64 and name.isascii() and name.replace('_', 'a').isalnum()
 
 def get_all_tools():
-    """Get all tools including base tools and MCP tools."""
-    all_tools = base_tools.copy()
-    mcp_tools = get_mcp_tools_openai_format()
-    all_tools.extend(mcp_tools)
-    return all_tools
+    """Get all tools including base tools and MCP tools.
 
-# Dynamic tools that includes MCP tools
-tools = get_all_tools()
+    The list is built once and shared until refresh_tools() is called.
+    """
+    global _TOOLS_CACHE
+    if _TOOLS_CACHE is None:
+        _TOOLS_CACHE = (*base_tools, *get_mcp_tools_openai_format())
+    return _TOOLS_CACHE
 
 def refresh_tools():
     """Refresh the tools list to include newly loaded MCP tools."""
-    global tools
-    tools = get_all_tools()
\ No newline at end of file
+    global _TOOLS_CACHE, _MCP_TOOLS_CACHE
+    _TOOLS_CACHE = _MCP_TOOLS_CACHE = None
+    return get_all_tools()
+
+def __getattr__(name):
+    # Dynamic tools that includes MCP tools, built on first access so that
+    # importing this module doesn't initialize the MCP manager
+    if name == "tools":
+        return get_all_tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
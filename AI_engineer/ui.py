@@ -1,36 +1,53 @@
 #!/usr/bin/env python3
 
+from rich.console import Group
 from rich.panel import Panel
 from rich.table import Table
-from .config import console, prompt_session, get_current_model
-from .providers import get_model_config, get_all_models, get_models_by_provider
+from .config import console, prompt_session, get_current_model, get_model_version
+from .providers import PROVIDERS, get_model_config, get_models_by_provider
 
 # --------------------------------------------------------------------------------
 # UI Components and Interface
 # --------------------------------------------------------------------------------
 
+# Title-cased provider names for display
+_PROVIDER_DISPLAY = {}
+
+def _display_provider(provider: str) -> str:
+    """Return the display form of a provider name, title-casing it only once."""
+    display = _PROVIDER_DISPLAY.get(provider)
+    if display is None:
+        display = _PROVIDER_DISPLAY[provider] = provider.title()
+    return display
+
+# Welcome panel per model name, built the first time that model is shown
+_WELCOME_PANELS = {}
+
 def display_welcome():
     """Display the welcome panel."""
     current_model = get_current_model()
-    model_config = get_model_config(current_model)
-    
-    # Create a beautiful gradient-style welcome panel
-    welcome_text = f"""[bold bright_green]🤖 AI Engineer[/bold bright_green] [bright_cyan]with Multi-Provider Support[/bright_cyan]
+    panel = _WELCOME_PANELS.get(current_model)
+    if panel is None:
+        model_config = get_model_config(current_model)
+        
+        # Create a beautiful gradient-style welcome panel
+        welcome_text = f"""[bold bright_green]🤖 AI Engineer[/bold bright_green] [bright_cyan]with Multi-Provider Support[/bright_cyan]
 [dim green]Current Model: {model_config.display_name if model_config else current_model}[/dim green]
-[dim green]Provider: {model_config.provider.title() if model_config else 'Unknown'}[/dim green]"""
+[dim green]Provider: {_display_provider(model_config.provider) if model_config else 'Unknown'}[/dim green]"""
+        
+        panel = _WELCOME_PANELS[current_model] = Panel.fit(
+            welcome_text,
+            border_style="bright_green",
+            padding=(1, 2),
+            title="[bold bright_green]🤖 AI Code Assistant[/bold bright_green]",
+            title_align="center"
+        )
     
-    console.print(Panel.fit(
-        welcome_text,
-        border_style="bright_green",
-        padding=(1, 2),
-        title="[bold bright_green]🤖 AI Code Assistant[/bold bright_green]",
-        title_align="center"
-    ))
+    console.print(panel)
 
-def display_instructions():
-    """Display the instruction panel."""
-    # Create an elegant instruction panel
-    instructions = """[bold bright_green]📁 File Operations:[/bold bright_green]
+# Create an elegant instruction panel; its content never changes
+_INSTRUCTIONS_PANEL = Panel(
+    """[bold bright_green]📁 File Operations:[/bold bright_green]
   • [bright_cyan]/add path/to/file[/bright_cyan] - Include a single file in conversation
   • [bright_cyan]/add path/to/folder[/bright_cyan] - Include all files in a folder
   • [dim]The AI can automatically read and create files using function calls[/dim]
@@ -48,24 +65,33 @@ def display_instructions():
 
 [bold bright_green]🎯 Commands:[/bold bright_green]
   • [bright_cyan]exit[/bright_cyan] or [bright_cyan]quit[/bright_cyan] - End the session
-  • Just ask naturally - the AI will handle file operations automatically!"""
-    
-    console.print(Panel(
-        instructions,
-        border_style="green",
-        padding=(1, 2),
-        title="[bold green]💡 How to Use[/bold green]",
-        title_align="left"
-    ))
+  • Just ask naturally - the AI will handle file operations automatically!""",
+    border_style="green",
+    padding=(1, 2),
+    title="[bold green]💡 How to Use[/bold green]",
+    title_align="left"
+)
+
+def display_instructions():
+    """Display the instruction panel."""
+    console.print(_INSTRUCTIONS_PANEL)
     console.print()
 
+# (model version, prompt) for the last input prompt; it only changes with the model
+_cached_prompt = (None, None)
+
 def get_user_input() -> str:
     """Get user input with styled prompt."""
+    global _cached_prompt
     try:
-        current_model = get_current_model()
-        model_config = get_model_config(current_model)
-        provider_name = model_config.provider.title() if model_config else "Unknown"
-        return prompt_session.prompt(f"🟢 You ({provider_name})> ").strip()
+        version = get_model_version()
+        cached_version, prompt = _cached_prompt
+        if cached_version != version:
+            model_config = get_model_config(get_current_model())
+            provider_name = _display_provider(model_config.provider) if model_config else "Unknown"
+            prompt = f"🟢 You ({provider_name})> "
+            _cached_prompt = (version, prompt)
+        return prompt_session.prompt(prompt).strip()
     except (EOFError, KeyboardInterrupt):
         console.print("\n[bold yellow]👋 Exiting gracefully...[/bold yellow]")
         return None
@@ -84,42 +110,37 @@ def display_error(error_message: str):
 
 def display_model_list():
     """Display all available models in a formatted table."""
-    models = get_all_models()
     current_model = get_current_model()
     
-    # Group models by provider
-    providers = {}
-    for model in models:
-        if model.provider not in providers:
-            providers[model.provider] = []
-        providers[model.provider].append(model)
+    # Collected and printed as one Group so the whole listing is a single write
+    renderables = ["\n[bold bright_blue]📋 Available Models:[/bold bright_blue]"]
     
-    console.print("\n[bold bright_blue]📋 Available Models:[/bold bright_blue]")
-    
-    for provider_name, provider_models in providers.items():
-        table = Table(title=f"{provider_name.title()} Models", show_header=True, header_style="bold magenta")
+    # Models are already grouped by provider in the providers module's index
+    for provider_name in PROVIDERS:
+        provider_models = get_models_by_provider(provider_name)
+        if not provider_models:
+            continue
+        
+        table = Table(title=f"{_display_provider(provider_name)} Models", show_header=True, header_style="bold magenta")
         table.add_column("Model Name", style="cyan", no_wrap=True)
         table.add_column("Display Name", style="white")
         table.add_column("Features", style="dim")
         table.add_column("Status", style="green")
         
         for model in provider_models:
-            features = []
-            if model.supports_reasoning:
-                features.append("Reasoning")
-            features_str = ", ".join(features) if features else "Standard"
-            
             status = "🟢 Current" if model.name == current_model else "⚪ Available"
             
             table.add_row(
                 model.name,
                 model.display_name,
-                features_str,
+                model.features_str,
                 status
             )
         
-        console.print(table)
-        console.print()
+        renderables.append(table)
+        renderables.append("")
+    
+    console.print(Group(*renderables))
 
 def display_current_model():
     """Display the currently selected model."""
@@ -128,7 +149,7 @@ def display_current_model():
     
     if model_config:
         console.print(f"\n[bold bright_blue]Current Model:[/bold bright_blue] {model_config.display_name}")
-        console.print(f"[bold bright_blue]Provider:[/bold bright_blue] {model_config.provider.title()}")
+        console.print(f"[bold bright_blue]Provider:[/bold bright_blue] {_display_provider(model_config.provider)}")
         console.print(f"[bold bright_blue]Model ID:[/bold bright_blue] {model_config.name}")
         if model_config.supports_reasoning:
             console.print("[bold bright_blue]Features:[/bold bright_blue] Chain-of-Thought Reasoning")
@@ -140,7 +161,7 @@ def display_model_switched(model_name: str):
     """Display confirmation that model was switched."""
     model_config = get_model_config(model_name)
     if model_config:
-        console.print(f"\n[bold green]✅ Switched to {model_config.display_name} ({model_config.provider.title()})[/bold green]")
+        console.print(f"\n[bold green]✅ Switched to {model_config.display_name} ({_display_provider(model_config.provider)})[/bold green]")
     else:
         console.print(f"\n[bold green]✅ Switched to {model_name}[/bold green]")
 